@@ -0,0 +1,3 @@
+"""
+Travel Route Optimizer backend package
+"""
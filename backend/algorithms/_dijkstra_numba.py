@@ -0,0 +1,156 @@
+"""
+Numba Dijkstra Kernel
+Optional JIT-compiled Dijkstra over CSR arrays
+
+Numba is not a hard dependency. When it (or NumPy) is missing,
+``dijkstra_csr`` is None and PathFinder falls back to pure Python.
+"""
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on installed extras
+    np = None
+    njit = None
+
+
+def to_arrays(indptr, neighbors, weights):
+    """
+    Convert the Graph's CSR lists into NumPy arrays for the kernel.
+
+    Args:
+        indptr (list): CSR row pointers
+        neighbors (list): Destination city id per edge
+        weights (dict): Optimization type -> weight list per edge
+
+    Returns:
+        tuple: (indptr, neighbors, weights) with contiguous arrays and
+               weights as a dict of float64 arrays
+    """
+    return (
+        np.asarray(indptr, dtype=np.int32),
+        np.asarray(neighbors, dtype=np.int32),
+        {key: np.asarray(values, dtype=np.float64) for key, values in weights.items()},
+    )
+
+
+def workspace(n, m):
+    """
+    Allocate the kernel's reusable work arrays.
+
+    Args:
+        n (int): Number of cities
+        m (int): Number of edges
+
+    Returns:
+        tuple: (dist, prev_node, prev_edge, touched, n_touched, keys, vals)
+               to pass to dijkstra_csr on every call for this graph
+    """
+    return (
+        np.full(n, np.inf),
+        np.full(n, -1, np.int32),
+        np.full(n, -1, np.int32),
+        np.empty(n, np.int32),
+        np.zeros(1, np.int64),
+        np.empty(m + 1, np.float64),
+        np.empty(m + 1, np.int32),
+    )
+
+
+if njit is not None:
+    @njit(cache=True)
+    def dijkstra_csr(indptr, neighbors, weights, src, dst,
+                     dist, prev_node, prev_edge, touched, n_touched, keys, vals):
+        """
+        Dijkstra over CSR arrays with a hand-rolled binary heap.
+
+        The heap is two parallel arrays (keys, values) with lazy deletion;
+        it can never hold more than one entry per successful relaxation,
+        so ``len(neighbors) + 1`` slots are always enough.
+
+        All arrays after ``dst`` come from workspace() and are reused
+        across calls. Cities reached by a call are listed in ``touched``,
+        and the next call resets only those entries, so a query that
+        explores k cities does O(k) setup and allocates nothing.
+
+        Args:
+            indptr (ndarray): CSR row pointers (int32)
+            neighbors (ndarray): Destination id per edge (int32)
+            weights (ndarray): Weight per edge (float64)
+            src (int): Source city id
+            dst (int): Destination city id, or -1 to settle every city
+
+        Returns:
+            tuple: (dist, prev_node, prev_edge), the workspace arrays; valid
+                   until the next call with the same workspace
+        """
+        for i in range(n_touched[0]):
+            v = touched[i]
+            dist[v] = np.inf
+            prev_node[v] = -1
+            prev_edge[v] = -1
+
+        dist[src] = 0.0
+        touched[0] = src
+        count = 1
+        keys[0] = 0.0
+        vals[0] = src
+        size = 1
+
+        while size > 0:
+            d = keys[0]
+            u = vals[0]
+
+            # Pop: move the last entry to the root and sift it down
+            size -= 1
+            if size > 0:
+                key = keys[size]
+                val = vals[size]
+                i = 0
+                while True:
+                    child = 2 * i + 1
+                    if child >= size:
+                        break
+                    if child + 1 < size and keys[child + 1] < keys[child]:
+                        child += 1
+                    if keys[child] >= key:
+                        break
+                    keys[i] = keys[child]
+                    vals[i] = vals[child]
+                    i = child
+                keys[i] = key
+                vals[i] = val
+
+            if u == dst:
+                break
+            if d > dist[u]:
+                continue
+
+            for e in range(indptr[u], indptr[u + 1]):
+                v = neighbors[e]
+                nd = d + weights[e]
+                if nd < dist[v]:
+                    if dist[v] == np.inf:
+                        touched[count] = v
+                        count += 1
+                    dist[v] = nd
+                    prev_node[v] = u
+                    prev_edge[v] = e
+
+                    # Push: append and sift up
+                    i = size
+                    size += 1
+                    while i > 0:
+                        parent = (i - 1) >> 1
+                        if keys[parent] <= nd:
+                            break
+                        keys[i] = keys[parent]
+                        vals[i] = vals[parent]
+                        i = parent
+                    keys[i] = nd
+                    vals[i] = v
+
+        n_touched[0] = count
+        return dist, prev_node, prev_edge
+else:
+    dijkstra_csr = None
@@ -4,18 +4,76 @@ Finds shortest and cheapest paths between cities
 """
 
 import heapq
-import itertools
-from graph import Graph
-from trip import Trip
-from city import City
+from collections import OrderedDict, deque
+from backend.models.graph import Graph
+from backend.models.trip import Trip
+from backend.models.city import City
+from backend.algorithms._dijkstra_numba import dijkstra_csr, to_arrays, workspace
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as csgraph_dijkstra
+except ImportError:  # pragma: no cover - depends on installed extras
+    csr_matrix = None
+    csgraph_dijkstra = None
+
+
+class _SearchBuffers:
+    """
+    Per-city search arrays reused across queries.
+    
+    Every city whose entries are written during a search is recorded in
+    ``touched``; reset() restores only those entries, so a query that
+    explores k cities pays O(k) setup instead of allocating O(N) lists.
+    """
+    
+    __slots__ = ('distances', 'previous', 'previous_edge', 'touched')
+    
+    def __init__(self, n):
+        self.distances = [float('infinity')] * n
+        self.previous = [-1] * n
+        self.previous_edge = [-1] * n
+        self.touched = []
+    
+    def reset(self):
+        """Restore every touched entry to its unset value"""
+        infinity = float('infinity')
+        distances = self.distances
+        previous = self.previous
+        previous_edge = self.previous_edge
+        
+        for city in self.touched:
+            distances[city] = infinity
+            previous[city] = -1
+            previous_edge[city] = -1
+        self.touched.clear()
 
 
 class PathFinder:
     """
     Implements Dijkstra's algorithm for finding optimal paths.
     Supports optimization by distance or cost.
+    
+    Search buffers are reused between queries, so a PathFinder must not be
+    shared between threads.
     """
     
+    # Use delta-stepping for pure Python point-to-point queries. It only
+    # matched Dijkstra on a 150x150 grid and was slower on a 20k-city ring,
+    # so it is opt-in.
+    DELTA_STEPPING = False
+    
+    # Use bidirectional Dijkstra for pure Python point-to-point queries.
+    # It settles fewer cities on grid-like road networks but is slower on
+    # the bundled data and on sparse ring-like graphs, so it is opt-in.
+    BIDIRECTIONAL = False
+    
+    # Maximum number of per-origin shortest-path trees kept in the cache
+    TREE_CACHE_SIZE = 64
+    
+    # Maximum number of find_path results kept in the cache
+    TRIP_CACHE_SIZE = 4096
+    
     def __init__(self, graph):
         """
         Initialize PathFinder with a graph.
@@ -30,12 +88,21 @@ class PathFinder:
             raise TypeError("Must provide a Graph object")
         
         self.graph = graph
-        self.counter = itertools.count()  # Used for tiebreaking in priority queue
+        self._jit_csr = None  # (csr_routes the arrays were built from, arrays, workspace)
+        self._buffers = None  # (csr_routes, forward _SearchBuffers, backward _SearchBuffers)
+        self._tree_cache = OrderedDict()  # {(source id, optimize_by): tree or None}
+        self._trip_cache = OrderedDict()  # {(origin key, destination key, optimize_by): Trip}
+        self._all_pairs = None  # {optimize_by: [tree per source id]} after compute_all_pairs()
+        self._cache_version = graph._version  # Graph version both caches are valid for
     
     def find_path(self, origin_name, destination_name, optimize_by='distance'):
         """
         Find optimal path between two cities using Dijkstra's algorithm.
         
+        Results are memoized per (origin, destination, optimize_by) until the
+        graph changes, so repeated queries return the same Trip object;
+        callers must treat it as read-only.
+        
         Args:
             origin_name (str): Name of the starting city
             destination_name (str): Name of the destination city
@@ -59,6 +126,27 @@ class PathFinder:
         if destination is None:
             raise ValueError(f"Destination city '{destination_name}' not found in graph")
         
+        self._sync_caches()
+        cache = self._trip_cache
+        key = (origin._key, destination._key, optimize_by)
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        
+        trip = self._find_trip(origin, destination, optimize_by)
+        
+        cache[key] = trip
+        if len(cache) > self.TRIP_CACHE_SIZE:
+            cache.popitem(last=False)
+        return trip
+    
+    def _find_trip(self, origin, destination, optimize_by):
+        """
+        Compute the Trip for a pair of resolved cities, bypassing the cache.
+        
+        Returns:
+            Trip: Trip with the calculated path, or empty Trip if no path exists
+        """
         # Create trip object
         trip = Trip(origin, destination, optimization_type=optimize_by)
         
@@ -67,6 +155,10 @@ class PathFinder:
             trip.set_path([origin], [])
             return trip
         
+        # Cities in different components can never be connected
+        if self.graph.component_of(origin) != self.graph.component_of(destination):
+            return trip
+        
         # Run Dijkstra's algorithm
         path, routes = self._dijkstra(origin, destination, optimize_by)
         
@@ -76,10 +168,45 @@ class PathFinder:
         
         return trip
     
+    def _sync_caches(self):
+        """Drop cached trips and trees if the graph changed since they were built"""
+        if self._cache_version != self.graph._version:
+            self._trip_cache.clear()
+            self._tree_cache.clear()
+            self._all_pairs = None
+            self._cache_version = self.graph._version
+    
+    def compute_all_pairs(self):
+        """
+        Precompute shortest-path trees from every city for both objectives.
+        
+        Afterwards every find_path query is answered by walking a stored
+        predecessor chain, which is O(path length), instead of searching.
+        This costs one full search per city and objective and O(N^2)
+        memory, so it suits small graphs loaded once at startup. The
+        trees are dropped if the graph changes.
+        """
+        self._sync_caches()
+        self.graph.build_csr()
+        sources = range(len(self.graph.csr_cities))
+        
+        self._all_pairs = {
+            optimize_by: [self._shortest_path_tree(source, optimize_by) for source in sources]
+            for optimize_by in ('distance', 'cost')
+        }
+    
     def _dijkstra(self, origin, destination, optimize_by):
         """
         Core Dijkstra's algorithm implementation.
         
+        Runs over the graph's CSR representation using integer city ids.
+        Queries are answered from precomputed all-pairs trees when
+        compute_all_pairs() has run, and repeated queries from one origin
+        from a cached shortest-path tree. Otherwise uses the Numba kernel when it is
+        installed, or a pure Python Dijkstra over the same flat lists
+        (delta-stepping when DELTA_STEPPING is set, bidirectional when
+        BIDIRECTIONAL is set).
+        
         Args:
             origin (City): Starting city
             destination (City): Destination city
@@ -89,80 +216,407 @@ class PathFinder:
             tuple: (path as list of cities, routes as list of Route objects)
                    Returns ([], []) if no path exists
         """
-        # Initialize data structures
-        # distances: stores the minimum cost/distance to reach each city
-        distances = {city: float('infinity') for city in self.graph.get_all_cities()}
-        distances[origin] = 0
+        graph = self.graph
+        graph.build_csr()
+        
+        source = graph.city_ids[origin]
+        target = graph.city_ids[destination]
+        
+        tree = self._cached_tree(source, optimize_by)
+        if tree is not None:
+            _, previous, previous_edge = tree
+        elif dijkstra_csr is not None:
+            previous, previous_edge = self._search_jit(source, target, optimize_by)
+        elif self.DELTA_STEPPING:
+            previous, previous_edge = self._delta_stepping(source, target, optimize_by)
+        elif self.BIDIRECTIONAL:
+            previous, previous_edge = self._bidirectional_search(source, target, optimize_by)
+        else:
+            previous, previous_edge = self._search(source, target, optimize_by)
+        
+        # Check if destination is reachable
+        if previous[target] == -1:
+            return [], []  # No path found
+        
+        return self._reconstruct(source, target, previous, previous_edge)
+    
+    def _cached_tree(self, source, optimize_by):
+        """
+        Look up the shortest-path tree for an origin in the LRU cache.
+        
+        The first query from an origin only records it, and a point-to-point
+        search answers that query. A second query from the same origin
+        settles the whole graph once, so later destinations only need path
+        reconstruction. The cache is cleared whenever the graph changes.
+        Trees from compute_all_pairs() take precedence over the cache.
+        
+        Returns:
+            tuple: (distances, previous, previous_edge), or None on a miss
+        """
+        self._sync_caches()
+        if self._all_pairs is not None:
+            return self._all_pairs[optimize_by][source]
         
-        # previous: stores the previous city in the optimal path
-        previous = {city: None for city in self.graph.get_all_cities()}
+        cache = self._tree_cache
+        key = (source, optimize_by)
+        if key in cache:
+            cache.move_to_end(key)
+            tree = cache[key]
+            if tree is None:
+                tree = cache[key] = self._shortest_path_tree(source, optimize_by)
+            return tree
         
-        # previous_route: stores the route taken to reach each city
-        previous_route = {city: None for city in self.graph.get_all_cities()}
+        cache[key] = None
+        if len(cache) > self.TREE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return None
+    
+    def _search_jit(self, source, target, optimize_by):
+        """
+        Run the Numba kernel from source until target is settled.
+        
+        Returns:
+            tuple: (previous, previous_edge) arrays indexed by city id
+        """
+        (indptr, neighbors, weights), work = self._jit_arrays()
+        
+        _, previous, previous_edge = dijkstra_csr(
+            indptr, neighbors, weights[optimize_by], source, target, *work
+        )
+        return previous, previous_edge
+    
+    def _jit_arrays(self):
+        """
+        NumPy copies of the graph's CSR lists and the kernel's reusable
+        work arrays, rebuilt when the graph changes.
         
-        # Priority queue: (distance/cost, counter, city)
-        # counter is used to break ties when distances are equal
-        pq = [(0, next(self.counter), origin)]
+        Returns:
+            tuple: ((indptr, neighbors, weights), workspace)
+        """
+        graph = self.graph
+        if self._jit_csr is None or self._jit_csr[0] is not graph.csr_routes:
+            arrays = to_arrays(graph.csr_indptr, graph.csr_neighbors, graph.csr_weights)
+            work = workspace(len(graph.csr_cities), len(graph.csr_neighbors))
+            self._jit_csr = (graph.csr_routes, arrays, work)
         
-        # visited set to track processed cities
-        visited = set()
+        return self._jit_csr[1], self._jit_csr[2]
+    
+    def _search(self, source, target, optimize_by):
+        """
+        Pure Python Dijkstra from source until target is settled.
         
-        while pq:
+        Returns:
+            tuple: (previous, previous_edge) lists indexed by city id
+        """
+        graph = self.graph
+        indptr = graph.csr_indptr
+        neighbors = graph.csr_neighbors
+        weights = graph.csr_weights[optimize_by]
+        
+        buffers = self._scratch()[0]
+        
+        # distances: minimum cost/distance to reach each city id
+        # previous / previous_edge: predecessor id and CSR edge index on the
+        # best known path (-1 when unset)
+        distances = buffers.distances
+        previous = buffers.previous
+        previous_edge = buffers.previous_edge
+        touched = buffers.touched
+        
+        distances[source] = 0
+        touched.append(source)
+        
+        # Priority queue: (distance/cost, city id). Improved cities are
+        # pushed again rather than updated in place; heapq is C code, so
+        # skipping the stale entries is cheaper than a Python decrease-key
+        heap = [(0, source)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        while heap:
             # Get city with minimum distance/cost
-            current_distance, _, current_city = heapq.heappop(pq)
-            
-            # Skip if already visited
-            if current_city in visited:
-                continue
+            current_distance, current = heappop(heap)
             
-            visited.add(current_city)
-            
-            # If we reached destination, we can stop
-            if current_city == destination:
+            # If we reached destination, we can stop. Its first pop carries
+            # its final distance, so this can precede the staleness check.
+            if current == target:
                 break
             
-            # Skip if this path is already longer than recorded
-            if current_distance > distances[current_city]:
+            # Skip entries superseded by a shorter path
+            if current_distance > distances[current]:
                 continue
             
-            # Check all neighbors
-            for route in self.graph.get_neighbors(current_city):
-                neighbor = route.destination
-                
-                # Skip if already visited
-                if neighbor in visited:
-                    continue
-                
-                # Calculate new distance/cost through current city
-                if optimize_by == 'distance':
-                    weight = route.distance
-                else:  # optimize_by == 'cost'
-                    weight = route.cost
-                
-                new_distance = distances[current_city] + weight
+            # Check all outgoing edges; the row is walked as contiguous
+            # slices so each edge costs no per-element list indexing
+            start, end = indptr[current], indptr[current + 1]
+            for edge, neighbor, weight in zip(range(start, end),
+                                              neighbors[start:end],
+                                              weights[start:end]):
+                new_distance = current_distance + weight
                 
                 # If we found a better path, update it
                 if new_distance < distances[neighbor]:
+                    if previous[neighbor] == -1:
+                        touched.append(neighbor)
                     distances[neighbor] = new_distance
-                    previous[neighbor] = current_city
-                    previous_route[neighbor] = route
-                    heapq.heappush(pq, (new_distance, next(self.counter), neighbor))
+                    previous[neighbor] = current
+                    previous_edge[neighbor] = edge
+                    heappush(heap, (new_distance, neighbor))
         
-        # Reconstruct path
-        path = []
-        routes = []
-        current = destination
+        return previous, previous_edge
+    
+    def _bidirectional_search(self, source, target, optimize_by):
+        """
+        Pure Python bidirectional Dijkstra between two distinct cities.
         
-        # Check if destination is reachable
-        if previous[destination] is None and destination != origin:
-            return [], []  # No path found
+        Alternates one pop of a forward search from source with one pop of
+        a backward search from target over the reverse CSR. The best
+        meeting point seen so far bounds the answer, and the search stops
+        once the two frontier minimums together can no longer beat it.
+        
+        Returns:
+            tuple: (previous, previous_edge) lists indexed by city id,
+                   describing the source -> target path (previous[target]
+                   is -1 if target is unreachable)
+        """
+        graph = self.graph
+        indptr = graph.csr_indptr
+        neighbors = graph.csr_neighbors
+        rev_indptr = graph.csr_rev_indptr
+        rev_neighbors = graph.csr_rev_neighbors
+        rev_edges = graph.csr_rev_edges
+        weights = graph.csr_weights[optimize_by]
+        
+        forward_buffers, backward_buffers = self._scratch()
+        
+        # Forward search: distance from source, predecessor towards source
+        dist_f = forward_buffers.distances
+        previous = forward_buffers.previous
+        previous_edge = forward_buffers.previous_edge
+        touched_f = forward_buffers.touched
+        
+        # Backward search: distance to target, successor towards target
+        dist_b = backward_buffers.distances
+        next_city = backward_buffers.previous
+        next_edge = backward_buffers.previous_edge
+        touched_b = backward_buffers.touched
+        
+        dist_f[source] = 0
+        touched_f.append(source)
+        dist_b[target] = 0
+        touched_b.append(target)
+        
+        # Lazy-deletion heaps of (distance, city id), as in _search. Stale
+        # entries only make a heap minimum smaller, so the stopping test
+        # below can run late but never early.
+        heap_f = [(0, source)]
+        heap_b = [(0, target)]
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        
+        best = float('infinity')  # Length of the best source -> target path found
+        meeting = -1     # City where that path crosses between the searches
+        forward = True
+        
+        while heap_f and heap_b:
+            if heap_f[0][0] + heap_b[0][0] >= best:
+                break
+            
+            if forward:
+                current_distance, current = heappop(heap_f)
+                if current_distance > dist_f[current]:
+                    continue
+                start, end = indptr[current], indptr[current + 1]
+                for edge, neighbor, weight in zip(range(start, end),
+                                                  neighbors[start:end],
+                                                  weights[start:end]):
+                    new_distance = current_distance + weight
+                    if new_distance < dist_f[neighbor]:
+                        if previous[neighbor] == -1:
+                            touched_f.append(neighbor)
+                        dist_f[neighbor] = new_distance
+                        previous[neighbor] = current
+                        previous_edge[neighbor] = edge
+                        heappush(heap_f, (new_distance, neighbor))
+                        
+                        total = new_distance + dist_b[neighbor]
+                        if total < best:
+                            best = total
+                            meeting = neighbor
+            else:
+                current_distance, current = heappop(heap_b)
+                if current_distance > dist_b[current]:
+                    continue
+                start, end = rev_indptr[current], rev_indptr[current + 1]
+                for neighbor, edge in zip(rev_neighbors[start:end],
+                                          rev_edges[start:end]):
+                    new_distance = current_distance + weights[edge]
+                    if new_distance < dist_b[neighbor]:
+                        if next_city[neighbor] == -1:
+                            touched_b.append(neighbor)
+                        dist_b[neighbor] = new_distance
+                        next_city[neighbor] = current
+                        next_edge[neighbor] = edge
+                        heappush(heap_b, (new_distance, neighbor))
+                        
+                        total = new_distance + dist_f[neighbor]
+                        if total < best:
+                            best = total
+                            meeting = neighbor
+            
+            forward = not forward
+        
+        if meeting == -1:
+            return previous, previous_edge
+        
+        # Splice the backward half onto the forward predecessor lists so
+        # the usual reconstruction can walk target -> meeting -> source
+        current = meeting
+        while current != target:
+            successor = next_city[current]
+            previous[successor] = current
+            previous_edge[successor] = next_edge[current]
+            touched_f.append(successor)
+            current = successor
+        
+        return previous, previous_edge
+    
+    def _delta_stepping(self, source, target, optimize_by):
+        """
+        Delta-stepping shortest paths from source.
+        
+        Tentative distances are grouped into buckets of width delta instead
+        of a global priority queue. Each bucket is drained by repeatedly
+        relaxing light edges of its cities (which may refill it), then the
+        heavy edges of everything it settled are relaxed once. Cities in a
+        bucket have final distances once the bucket is done, so the search
+        stops after the bucket holding target; pass target=-1 to settle
+        every reachable city.
+        
+        Returns:
+            tuple: (previous, previous_edge) lists indexed by city id
+        """
+        graph = self.graph
+        neighbors = graph.csr_neighbors
+        weights = graph.csr_weights[optimize_by]
+        delta, light_indptr, light_edges, heavy_indptr, heavy_edges = \
+            graph.build_delta_csr(optimize_by)
+        
+        buffers = self._scratch()[0]
+        distances = buffers.distances
+        previous = buffers.previous
+        previous_edge = buffers.previous_edge
+        touched = buffers.touched
+        infinity = float('infinity')
+        
+        distances[source] = 0
+        touched.append(source)
+        buckets = [[source]]
+        
+        def relax(edge, current):
+            neighbor = neighbors[edge]
+            new_distance = distances[current] + weights[edge]
+            if new_distance < distances[neighbor]:
+                if distances[neighbor] == infinity:
+                    touched.append(neighbor)
+                distances[neighbor] = new_distance
+                previous[neighbor] = current
+                previous_edge[neighbor] = edge
+                index = int(new_distance // delta)
+                if index >= len(buckets):
+                    buckets.extend([] for _ in range(index + 1 - len(buckets)))
+                buckets[index].append(neighbor)
+        
+        i = 0
+        while i < len(buckets):
+            # Target settled in an earlier bucket: its distance is final
+            if target != -1 and distances[target] < i * delta:
+                break
+            
+            settled = set()
+            while buckets[i]:
+                # Entries whose distance has since dropped into an earlier
+                # bucket are stale
+                frontier = {city for city in buckets[i] if distances[city] // delta == i}
+                buckets[i] = []
+                settled |= frontier
+                
+                for current in frontier:
+                    for k in range(light_indptr[current], light_indptr[current + 1]):
+                        relax(light_edges[k], current)
+            
+            for current in settled:
+                for k in range(heavy_indptr[current], heavy_indptr[current + 1]):
+                    relax(heavy_edges[k], current)
+            
+            i += 1
+        
+        return previous, previous_edge
+    
+    def _shortest_path_tree(self, source, optimize_by):
+        """
+        Settle every city reachable from source.
+        
+        Unlike the point-to-point searches, the result does not alias the
+        reusable search buffers, so callers may keep it.
+        
+        Returns:
+            tuple: (distances, previous, previous_edge) indexed by city id
+        """
+        if dijkstra_csr is not None:
+            (indptr, neighbors, weights), work = self._jit_arrays()
+            tree = dijkstra_csr(indptr, neighbors, weights[optimize_by], source, -1, *work)
+            return tuple(array.copy() for array in tree)
+        
+        previous, previous_edge = self._search(source, -1, optimize_by)
+        distances = self._buffers[1].distances
+        return list(distances), list(previous), list(previous_edge)
+    
+    def _scratch(self):
+        """
+        Get the forward and backward search buffers, reset for a new query.
+        
+        The buffers are only reallocated when the graph's CSR view has
+        been rebuilt since the last search.
+        
+        Returns:
+            tuple: (forward _SearchBuffers, backward _SearchBuffers)
+        """
+        graph = self.graph
+        if self._buffers is None or self._buffers[0] is not graph.csr_routes:
+            n = len(graph.csr_cities)
+            self._buffers = (graph.csr_routes, _SearchBuffers(n), _SearchBuffers(n))
+        
+        _, forward, backward = self._buffers
+        forward.reset()
+        backward.reset()
+        return forward, backward
+    
+    def _reconstruct(self, source, target, previous, previous_edge):
+        """
+        Walk predecessor arrays back from target to source.
+        
+        Args:
+            source (int): Id of the starting city
+            target (int): Id of the destination city
+            previous (list): Predecessor city id per city id
+            previous_edge (list): CSR edge index used to reach each city id
+            
+        Returns:
+            tuple: (path as list of cities, routes as list of Route objects)
+        """
+        cities = self.graph.csr_cities
+        edge_routes = self.graph.csr_routes
+        
+        path = [cities[target]]
+        routes = []
+        current = target
         
         # Build path from destination to origin
-        while current is not None:
-            path.append(current)
-            if previous[current] is not None:
-                routes.append(previous_route[current])
+        while current != source:
+            routes.append(edge_routes[previous_edge[current]])
             current = previous[current]
+            path.append(cities[current])
         
         # Reverse to get path from origin to destination
         path.reverse()
@@ -170,10 +624,146 @@ class PathFinder:
         
         return path, routes
     
+    def all_sources(self, optimize_by='distance', sources=None):
+        """
+        Compute shortest-path trees from many origins in one call.
+        
+        Uses SciPy's compiled ``csgraph.dijkstra`` when SciPy is installed,
+        otherwise runs one full search per origin with the Numba kernel or,
+        without Numba, in pure Python.
+        
+        Args:
+            optimize_by (str): 'distance' or 'cost' (default: 'distance')
+            sources (list): Names of the origin cities (default: all cities)
+            
+        Returns:
+            tuple: (distances, predecessors) with one row per origin. Columns
+                   follow the city ids of ``graph.csr_cities``; unreachable
+                   cities have distance inf and predecessor -1. The
+                   container depends on the backend: 2-D NumPy arrays with
+                   SciPy, lists of 1-D NumPy arrays with Numba only, and
+                   lists of lists otherwise.
+            
+        Raises:
+            ValueError: If a city doesn't exist or optimize_by is invalid
+        """
+        if optimize_by not in ['distance', 'cost']:
+            raise ValueError("optimize_by must be 'distance' or 'cost'")
+        
+        graph = self.graph
+        graph.build_csr()
+        
+        if sources is None:
+            source_ids = list(range(len(graph.csr_cities)))
+        else:
+            source_ids = []
+            for name in sources:
+                city = graph.get_city(name)
+                if city is None:
+                    raise ValueError(f"Origin city '{name}' not found in graph")
+                source_ids.append(graph.city_ids[city])
+        
+        if csgraph_dijkstra is not None:
+            distances, predecessors = csgraph_dijkstra(
+                self._scipy_matrix(optimize_by), directed=True,
+                indices=source_ids, return_predecessors=True
+            )
+            predecessors[predecessors < 0] = -1  # SciPy marks "none" with -9999
+            return distances, predecessors
+        
+        distances = []
+        predecessors = []
+        for source in source_ids:
+            tree_distances, previous, _ = self._shortest_path_tree(source, optimize_by)
+            distances.append(tree_distances)
+            predecessors.append(previous)
+        return distances, predecessors
+    
+    def _scipy_matrix(self, optimize_by):
+        """
+        Build a SciPy CSR adjacency matrix for the given weights.
+        
+        Parallel routes between the same pair of cities are collapsed to
+        the cheapest one, since SciPy would otherwise sum duplicates.
+        """
+        graph = self.graph
+        indptr = graph.csr_indptr
+        neighbors = graph.csr_neighbors
+        weights = graph.csr_weights[optimize_by]
+        n = len(graph.csr_cities)
+        
+        cheapest = {}
+        for u in range(n):
+            for edge in range(indptr[u], indptr[u + 1]):
+                key = (u, neighbors[edge])
+                if key not in cheapest or weights[edge] < cheapest[key]:
+                    cheapest[key] = weights[edge]
+        
+        rows = [u for u, _ in cheapest]
+        cols = [v for _, v in cheapest]
+        return csr_matrix((list(cheapest.values()), (rows, cols)), shape=(n, n))
+    
+    def trip_from_predecessors(self, predecessors, origin_name, destination_name,
+                               optimize_by='distance'):
+        """
+        Rebuild a Trip from one predecessor row returned by all_sources().
+        
+        Args:
+            predecessors (list): Predecessor row computed for origin_name
+            origin_name (str): Name of the origin the row was computed for
+            destination_name (str): Name of the destination city
+            optimize_by (str): Objective the row was computed with
+            
+        Returns:
+            Trip: Trip along the predecessor chain, or empty Trip if the
+                  destination is unreachable
+            
+        Raises:
+            ValueError: If cities don't exist
+        """
+        graph = self.graph
+        graph.build_csr()
+        
+        origin = graph.get_city(origin_name)
+        destination = graph.get_city(destination_name)
+        if origin is None:
+            raise ValueError(f"Origin city '{origin_name}' not found in graph")
+        if destination is None:
+            raise ValueError(f"Destination city '{destination_name}' not found in graph")
+        
+        trip = Trip(origin, destination, optimization_type=optimize_by)
+        
+        source = graph.city_ids[origin]
+        target = graph.city_ids[destination]
+        indptr = graph.csr_indptr
+        neighbors = graph.csr_neighbors
+        weights = graph.csr_weights[optimize_by]
+        
+        previous = {}
+        previous_edge = {}
+        current = target
+        while current != source:
+            parent = int(predecessors[current])
+            if parent == -1:
+                return trip  # No path found
+            
+            # Predecessors only name cities; pick the cheapest route between them
+            edge = min((e for e in range(indptr[parent], indptr[parent + 1])
+                        if neighbors[e] == current), key=weights.__getitem__)
+            previous[current] = parent
+            previous_edge[current] = edge
+            current = parent
+        
+        path, routes = self._reconstruct(source, target, previous, previous_edge)
+        trip.set_path(path, routes)
+        return trip
+    
     def find_all_paths(self, origin_name, destination_name):
         """
         Find both shortest and cheapest paths.
         Convenient method to compare both optimization strategies.
+        Both searches share the graph's cached CSR view, so it is built once,
+        and each is answered from the result cache when already computed.
         
         Args:
             origin_name (str): Name of the starting city
@@ -204,29 +794,27 @@ class PathFinder:
         if origin is None:
             return []
         
-        reachable = set()
-        visited = set()
-        queue = [origin]
+        # Cities are marked visited when enqueued, so each is queued once
+        visited = {origin}
+        queue = deque([origin])
         
         while queue:
-            current = queue.pop(0)
-            if current in visited:
-                continue
-            
-            visited.add(current)
-            reachable.add(current.name)
+            current = queue.popleft()
             
             for route in self.graph.get_neighbors(current):
-                if route.destination not in visited:
-                    queue.append(route.destination)
+                neighbor = route.destination
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    queue.append(neighbor)
         
-        reachable.discard(origin_name)  # Remove origin itself
+        reachable = {city.name for city in visited}
+        reachable.discard(origin.name)  # Remove origin itself
         return sorted(list(reachable))
 
 
 # Example usage and testing
 if __name__ == "__main__":
-    from route import Route
+    from backend.models.route import Route
     
     # Create a sample graph
     print("=== Creating Sample Travel Network ===\n")
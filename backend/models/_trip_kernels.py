@@ -0,0 +1,61 @@
+"""
+Numba Trip Kernels
+Optional JIT-compiled reductions over a Trip's segment arrays
+
+Numba is not a hard dependency. When it (or NumPy) is missing,
+``summarize`` is None and Trip computes the same values in pure Python.
+"""
+
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on installed extras
+    np = None
+    njit = None
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _summarize(dist, cost):
+        """
+        Totals and per-segment cost per km in one pass.
+
+        fastmath is deliberately off: it permits reciprocal division,
+        which would make the ratios differ from Route.cost_per_km().
+
+        Args:
+            dist (ndarray): Distance per segment (float64)
+            cost (ndarray): Cost per segment (float64)
+
+        Returns:
+            tuple: (total_distance, total_cost, cost_per_km array)
+        """
+        n = dist.shape[0]
+        ratios = np.empty(n, np.float64)
+        total_dist = 0.0
+        total_cost = 0.0
+        for i in range(n):
+            total_dist += dist[i]
+            total_cost += cost[i]
+            ratios[i] = cost[i] / dist[i]
+        return total_dist, total_cost, ratios
+
+    def summarize(dist, cost):
+        """
+        Summarize a trip's segment arrays with the JIT kernel.
+
+        Args:
+            dist (array): Distance per segment, array('d')
+            cost (array): Cost per segment, array('d')
+
+        Returns:
+            tuple: (total_distance, total_cost, cost_per_km list), the
+                   ratios unrounded
+        """
+        total_dist, total_cost, ratios = _summarize(
+            np.frombuffer(dist, dtype=np.float64),
+            np.frombuffer(cost, dtype=np.float64),
+        )
+        return float(total_dist), float(total_cost), ratios.tolist()
+else:
+    summarize = None
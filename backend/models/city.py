@@ -3,6 +3,13 @@ City Model
 Represents a city in the route optimization system
 """
 
+import sys
+from math import radians, sin, cos, sqrt, atan2
+
+# Earth's radius in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+
 class City:
     """
     Represents a city with its properties.
@@ -13,6 +20,13 @@ class City:
         longitude (float): Longitude coordinate
     """
     
+    # Cities are allocated once per graph node and used as dict keys
+    # everywhere, so skip the per-instance __dict__
+    __slots__ = (
+        'name', 'latitude', 'longitude', '_key', '_hash',
+        '_cos_lat', '_sin_half_lat', '_cos_half_lat', '_sin_half_lon', '_cos_half_lon',
+    )
+    
     def __init__(self, name, latitude=0.0, longitude=0.0):
         """
         Initialize a City object.
@@ -37,9 +51,29 @@ class City:
         if not (-180 <= longitude <= 180):
             raise ValueError("Longitude must be between -180 and 180")
         
-        self.name = name.strip()
+        # Interned so the name keys of Graph.cities and the route endpoint
+        # names looked up in it are the same string object
+        self.name = sys.intern(name.strip())
         self.latitude = float(latitude)
         self.longitude = float(longitude)
+        
+        # Case-insensitive identity, computed once since cities are dict keys
+        # in every graph lookup and search. Interning makes equal keys the
+        # same object, so key comparisons hit CPython's identity fast path.
+        self._key = sys.intern(self.name.lower())
+        self._hash = hash(self._key)
+        
+        # Trig terms for the Haversine formula, computed once per city.
+        # Half-angle sines/cosines let distance_to get sin(dlat/2) and
+        # sin(dlon/2) from the angle-difference identity without calling
+        # any trig function per pair.
+        lat_rad = radians(self.latitude)
+        lon_rad = radians(self.longitude)
+        self._cos_lat = cos(lat_rad)
+        self._sin_half_lat = sin(lat_rad / 2)
+        self._cos_half_lat = cos(lat_rad / 2)
+        self._sin_half_lon = sin(lon_rad / 2)
+        self._cos_half_lon = cos(lon_rad / 2)
     
     def __str__(self):
         """String representation of the city"""
@@ -59,16 +93,14 @@ class City:
         Returns:
             bool: True if cities have the same name
         """
-        if not isinstance(other, City):
-            return False
-        return self.name.lower() == other.name.lower()
+        return isinstance(other, City) and self._key == other._key
     
     def __hash__(self):
         """
         Make City hashable so it can be used in sets and as dict keys.
         Required for graph implementations.
         """
-        return hash(self.name.lower())
+        return self._hash
     
     def to_dict(self):
         """
@@ -115,28 +147,50 @@ class City:
         Returns:
             float: Distance in kilometers
         """
-        from math import radians, sin, cos, sqrt, atan2
-        
         if not isinstance(other, City):
             raise TypeError("Can only calculate distance to another City object")
         
-        # Earth's radius in kilometers
-        R = 6371.0
-        
-        # Convert to radians
-        lat1 = radians(self.latitude)
-        lon1 = radians(self.longitude)
-        lat2 = radians(other.latitude)
-        lon2 = radians(other.longitude)
+        return round(self._haversine(other), 2)
+    
+    def _haversine(self, other):
+        """Unrounded Haversine distance in km using the cached trig terms"""
+        # sin((b - a) / 2) = sin(b/2)cos(a/2) - cos(b/2)sin(a/2)
+        sin_dlat = other._sin_half_lat * self._cos_half_lat - other._cos_half_lat * self._sin_half_lat
+        sin_dlon = other._sin_half_lon * self._cos_half_lon - other._cos_half_lon * self._sin_half_lon
         
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = sin(dlat / 2)**2 + cos(lat1) * cos(lat2) * sin(dlon / 2)**2
+        a = sin_dlat * sin_dlat + self._cos_lat * other._cos_lat * sin_dlon * sin_dlon
+        # Rounding in the cached terms can push a just past 1 for
+        # near-antipodal cities, where sqrt(1 - a) would fail
+        a = min(1.0, max(0.0, a))
         c = 2 * atan2(sqrt(a), sqrt(1 - a))
         
-        distance = R * c
-        return round(distance, 2)
+        return EARTH_RADIUS_KM * c
+    
+    @staticmethod
+    def haversine_matrix(cities):
+        """
+        Calculate all pairwise distances between cities in one pass.
+        
+        Args:
+            cities (list): List of City objects
+            
+        Returns:
+            list: N x N nested list where [i][j] is the distance in km
+                  between cities[i] and cities[j]
+        """
+        n = len(cities)
+        matrix = [[0.0] * n for _ in range(n)]
+        
+        # Distances are symmetric, so only the upper triangle is computed
+        for i in range(n):
+            city = cities[i]
+            row = matrix[i]
+            for j in range(i + 1, n):
+                distance = round(city._haversine(cities[j]), 2)
+                row[j] = distance
+                matrix[j][i] = distance
+        
+        return matrix
 
 
 # Example usage (for testing)
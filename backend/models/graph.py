@@ -3,9 +3,11 @@ Graph Model
 Manages the network of cities and routes
 """
 
-from collections import defaultdict
-from city import City
-from route import Route
+from array import array
+from collections import defaultdict, deque
+from operator import attrgetter
+from backend.models.city import City
+from backend.models.route import Route
 
 
 class Graph:
@@ -15,13 +17,23 @@ class Graph:
     
     Attributes:
         cities (dict): Dictionary mapping city names to City objects
+        _city_index (dict): Case-insensitive lookup, lowercased name -> City
         adjacency_list (dict): Dictionary mapping cities to their connected routes
     """
     
     def __init__(self):
         """Initialize an empty graph"""
         self.cities = {}  # {city_name: City object}
+        self._city_index = {}  # {lowercased city_name: City object}
         self.adjacency_list = defaultdict(list)  # {City: [Route, Route, ...]}
+        self._csr_valid = False  # CSR arrays are rebuilt lazily after mutation
+        self._columns_valid = False  # Column arrays are rebuilt lazily after mutation
+        self._routes_cache = None  # Deduplicated routes, rebuilt after mutation
+        self._delta_csr = {}  # {optimize_by: light/heavy edge split}
+        self._version = 0  # Bumped on every mutation so caches can detect changes
+        self._uf_parent = {}  # Union-find over city keys: key -> parent key
+        self._uf_rank = {}  # Union-find rank (upper bound on tree height)
+        self._distance_matrix = None  # Pairwise great-circle distances, built lazily
     
     def add_city(self, city):
         """
@@ -32,18 +44,58 @@ class Graph:
             
         Raises:
             TypeError: If city is not a City object
-            ValueError: If city already exists
+            ValueError: If city already exists (names are case-insensitive)
         """
         if not isinstance(city, City):
             raise TypeError("Must provide a City object")
         
-        if city.name in self.cities:
+        if city._key in self._city_index:
             raise ValueError(f"City '{city.name}' already exists in graph")
         
         self.cities[city.name] = city
+        self._city_index[city._key] = city
+        self._uf_parent[city._key] = city._key
+        self._uf_rank[city._key] = 0
         # Initialize empty adjacency list for this city
         if city not in self.adjacency_list:
             self.adjacency_list[city] = []
+        self._distance_matrix = None
+        self._mark_modified()
+    
+    def add_cities(self, cities):
+        """
+        Add many cities to the graph at once.
+        
+        All cities are validated before any is added, so a bad batch leaves
+        the graph unchanged, and derived caches are invalidated only once.
+        
+        Args:
+            cities (iterable): City objects to add
+            
+        Raises:
+            TypeError: If any item is not a City object
+            ValueError: If any city already exists or appears twice in the batch
+        """
+        cities = list(cities)
+        index = self._city_index
+        seen = set()
+        for city in cities:
+            if not isinstance(city, City):
+                raise TypeError("Must provide a City object")
+            if city._key in index or city._key in seen:
+                raise ValueError(f"City '{city.name}' already exists in graph")
+            seen.add(city._key)
+        
+        adjacency_list = self.adjacency_list
+        for city in cities:
+            self.cities[city.name] = city
+            index[city._key] = city
+            self._uf_parent[city._key] = city._key
+            self._uf_rank[city._key] = 0
+            if city not in adjacency_list:
+                adjacency_list[city] = []
+        self._distance_matrix = None
+        self._mark_modified()
     
     def add_route(self, route):
         """
@@ -60,9 +112,9 @@ class Graph:
             raise TypeError("Must provide a Route object")
         
         # Add cities if they don't exist
-        if route.origin.name not in self.cities:
+        if route.origin._key not in self._city_index:
             self.add_city(route.origin)
-        if route.destination.name not in self.cities:
+        if route.destination._key not in self._city_index:
             self.add_city(route.destination)
         
         # Add route to adjacency list
@@ -78,10 +130,63 @@ class Graph:
                 bidirectional=False  # Avoid infinite loop
             )
             self.adjacency_list[route.destination].append(reverse_route)
+        
+        self._union(route.origin._key, route.destination._key)
+        self._mark_modified()
+    
+    def add_routes(self, routes):
+        """
+        Add many routes to the graph at once.
+        Automatically adds cities if they don't exist.
+        
+        All routes are type-checked before any is added, and derived caches
+        are invalidated only once for the whole batch.
+        
+        Args:
+            routes (iterable): Route objects to add
+            
+        Raises:
+            TypeError: If any item is not a Route object
+        """
+        routes = list(routes)
+        for route in routes:
+            if not isinstance(route, Route):
+                raise TypeError("Must provide a Route object")
+        
+        # Endpoints not yet in the graph, first occurrence of each key wins
+        new_cities = {}
+        index = self._city_index
+        for route in routes:
+            for city in (route.origin, route.destination):
+                if city._key not in index and city._key not in new_cities:
+                    new_cities[city._key] = city
+        if new_cities:
+            self.add_cities(new_cities.values())
+        
+        adjacency_list = self.adjacency_list
+        for route in routes:
+            adjacency_list[route.origin].append(route)
+            if route.bidirectional:
+                adjacency_list[route.destination].append(Route(
+                    route.destination,
+                    route.origin,
+                    route.distance,
+                    route.cost,
+                    bidirectional=False  # Avoid infinite loop
+                ))
+            self._union(route.origin._key, route.destination._key)
+        self._mark_modified()
+    
+    def _mark_modified(self):
+        """Invalidate derived views after the cities or routes change"""
+        self._csr_valid = False
+        self._columns_valid = False
+        self._routes_cache = None
+        self._version += 1
     
     def get_city(self, city_name):
         """
-        Get a city by name.
+        Get a city by name. Matching is case-insensitive, like City equality.
         
         Args:
             city_name (str): Name of the city
@@ -89,7 +194,59 @@ class Graph:
         Returns:
             City: City object if found, None otherwise
         """
-        return self.cities.get(city_name)
+        if not isinstance(city_name, str):
+            return None
+        return self._city_index.get(city_name.strip().lower())
+    
+    def component_of(self, city):
+        """
+        Get the connected component a city belongs to.
+        
+        Components ignore route direction, so cities in different
+        components can never reach each other. The same component is a
+        necessary but not sufficient condition when one-way routes exist.
+        
+        Args:
+            city (City or str): City object or city name
+            
+        Returns:
+            str: Key of the component's representative city, or None if
+                 the city is not in the graph
+        """
+        if isinstance(city, City):
+            key = city._key
+        elif isinstance(city, str):
+            key = city.strip().lower()
+        else:
+            return None
+        
+        if key not in self._uf_parent:
+            return None
+        return self._find(key)
+    
+    def _find(self, key):
+        """Find the union-find root of a city key, compressing the path"""
+        parent = self._uf_parent
+        root = key
+        while parent[root] != root:
+            root = parent[root]
+        while parent[key] != root:
+            parent[key], key = root, parent[key]
+        return root
+    
+    def _union(self, key_a, key_b):
+        """Merge the components of two city keys (union by rank)"""
+        root_a = self._find(key_a)
+        root_b = self._find(key_b)
+        if root_a == root_b:
+            return
+        
+        rank = self._uf_rank
+        if rank[root_a] < rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self._uf_parent[root_b] = root_a
+        if rank[root_a] == rank[root_b]:
+            rank[root_a] += 1
     
     def get_neighbors(self, city):
         """
@@ -118,6 +275,21 @@ class Graph:
         """
         return list(self.cities.values())
     
+    def distance_matrix(self):
+        """
+        Get great-circle distances between every pair of cities.
+        
+        Computed in one batch with City.haversine_matrix on first use and
+        cached until a city is added; adding routes does not affect it.
+        
+        Returns:
+            list: N x N nested list in get_all_cities() order, where [i][j]
+                  equals cities[i].distance_to(cities[j])
+        """
+        if self._distance_matrix is None:
+            self._distance_matrix = City.haversine_matrix(self.get_all_cities())
+        return self._distance_matrix
+    
     def get_all_routes(self):
         """
         Get all routes in the graph.
@@ -125,18 +297,188 @@ class Graph:
         Returns:
             list: List of unique Route objects
         """
+        return list(self._unique_routes())
+    
+    def _unique_routes(self):
+        """Build (or reuse) the cached list of deduplicated routes"""
+        if self._routes_cache is None:
+            routes = []
+            seen = set()
+            
+            for route_list in self.adjacency_list.values():
+                for route in route_list:
+                    # Unordered endpoint pair, so A->B and B->A count once
+                    route_id = route._endpoint_key
+                    if route_id not in seen:
+                        routes.append(route)
+                        seen.add(route_id)
+            
+            self._routes_cache = routes
+        
+        return self._routes_cache
+    
+    def build_csr(self):
+        """
+        Build a compressed sparse row (CSR) view of the adjacency list.
+        
+        Cities are numbered 0..N-1 in insertion order. The outgoing routes of
+        city ``u`` occupy the slice ``csr_indptr[u]:csr_indptr[u + 1]`` of the
+        parallel lists ``csr_neighbors`` (destination ids), ``csr_dist_w``,
+        ``csr_cost_w`` and ``csr_routes`` (the Route objects themselves).
+        Each city's slice is ordered by ascending distance, so searches try
+        the shortest outgoing routes first.
+        
+        ``csr_weights`` maps each optimization type ('distance' or 'cost') to
+        its weight list, so searches pick their weights with one lookup and
+        never branch on the objective inside the relaxation loop.
+        
+        A reverse CSR over incoming routes is built alongside it for
+        backward searches: ``csr_rev_indptr[v]:csr_rev_indptr[v + 1]`` slices
+        ``csr_rev_neighbors`` (origin ids) and ``csr_rev_edges`` (the forward
+        edge index, which also selects the weight).
+        
+        The result is cached and only rebuilt after the graph is mutated,
+        so calling this before every search is cheap.
+        """
+        if self._csr_valid:
+            return
+        
+        cities = list(self.cities.values())
+        city_ids = {city: i for i, city in enumerate(cities)}
+        
+        indptr = [0] * (len(cities) + 1)
+        neighbors = []
+        dist_w = []
+        cost_w = []
         routes = []
-        seen = set()
         
-        for city, route_list in self.adjacency_list.items():
-            for route in route_list:
-                # Create unique identifier for route
-                route_id = tuple(sorted([route.origin.name, route.destination.name]))
-                if route_id not in seen:
-                    routes.append(route)
-                    seen.add(route_id)
+        by_distance = attrgetter('distance')
+        for i, city in enumerate(cities):
+            for route in sorted(self.adjacency_list.get(city, []), key=by_distance):
+                neighbors.append(city_ids[route.destination])
+                dist_w.append(route.distance)
+                cost_w.append(route.cost)
+                routes.append(route)
+            indptr[i + 1] = len(neighbors)
+        
+        # Reverse CSR: count incoming edges per city, then fill by offset
+        rev_indptr = [0] * (len(cities) + 1)
+        for v in neighbors:
+            rev_indptr[v + 1] += 1
+        for i in range(len(cities)):
+            rev_indptr[i + 1] += rev_indptr[i]
+        
+        rev_neighbors = [0] * len(neighbors)
+        rev_edges = [0] * len(neighbors)
+        fill = rev_indptr[:-1]
+        for u in range(len(cities)):
+            for edge in range(indptr[u], indptr[u + 1]):
+                slot = fill[neighbors[edge]]
+                rev_neighbors[slot] = u
+                rev_edges[slot] = edge
+                fill[neighbors[edge]] = slot + 1
+        
+        self.city_ids = city_ids  # {City: int id}
+        self.csr_cities = cities  # [City, ...] indexed by id
+        self.csr_indptr = indptr
+        self.csr_neighbors = neighbors
+        self.csr_dist_w = dist_w
+        self.csr_cost_w = cost_w
+        self.csr_weights = {'distance': dist_w, 'cost': cost_w}
+        self.csr_routes = routes
+        self.csr_rev_indptr = rev_indptr
+        self.csr_rev_neighbors = rev_neighbors
+        self.csr_rev_edges = rev_edges
+        self._delta_csr = {}
+        self._csr_valid = True
+    
+    @property
+    def csr(self):
+        """
+        Forward CSR arrays, built on demand.
+        
+        Returns:
+            tuple: (csr_indptr, csr_neighbors, csr_dist_w, csr_cost_w)
+        """
+        self.build_csr()
+        return self.csr_indptr, self.csr_neighbors, self.csr_dist_w, self.csr_cost_w
+    
+    def build_columns(self):
+        """
+        Build a column (structure-of-arrays) view of cities and routes.
+        
+        Cities are numbered in insertion order, like build_csr. Their data
+        is split into ``city_names`` and the float arrays ``city_lat`` and
+        ``city_lon``. Unique routes (as from get_all_routes) become
+        ``route_src``/``route_dst`` (city numbers), ``route_dist``,
+        ``route_cost`` and ``route_bidirectional``. Bulk readers such as the
+        API listing endpoints iterate the aligned columns instead of
+        reading attributes object by object.
+        
+        The result is cached and only rebuilt after the graph is mutated.
+        """
+        if self._columns_valid:
+            return
+        
+        cities = list(self.cities.values())
+        ids = {city: i for i, city in enumerate(cities)}
+        routes = self._unique_routes()
         
-        return routes
+        self.city_names = [city.name for city in cities]
+        self.city_lat = array('d', [city.latitude for city in cities])
+        self.city_lon = array('d', [city.longitude for city in cities])
+        self.route_src = array('i', [ids[route.origin] for route in routes])
+        self.route_dst = array('i', [ids[route.destination] for route in routes])
+        self.route_dist = array('d', [route.distance for route in routes])
+        self.route_cost = array('d', [route.cost for route in routes])
+        self.route_bidirectional = [route.bidirectional for route in routes]
+        self._columns_valid = True
+    
+    def build_delta_csr(self, optimize_by):
+        """
+        Split the CSR edges into light and heavy sets for delta-stepping.
+        
+        The bucket width is ``delta = max_weight / average_out_degree``.
+        Edges with weight <= delta are light and may land back in the
+        bucket being processed; heavier edges are relaxed once per bucket.
+        The split is cached per optimization type until the graph changes.
+        
+        Args:
+            optimize_by (str): 'distance' or 'cost'
+            
+        Returns:
+            tuple: (delta, light_indptr, light_edges, heavy_indptr, heavy_edges)
+                   where the edge lists hold forward CSR edge indices
+        """
+        self.build_csr()
+        
+        cached = self._delta_csr.get(optimize_by)
+        if cached is not None:
+            return cached
+        
+        indptr = self.csr_indptr
+        weights = self.csr_weights[optimize_by]
+        n = len(self.csr_cities)
+        
+        delta = max(weights) * n / len(weights) if weights else 1.0
+        
+        light_indptr = [0] * (n + 1)
+        light_edges = []
+        heavy_indptr = [0] * (n + 1)
+        heavy_edges = []
+        
+        for u in range(n):
+            for edge in range(indptr[u], indptr[u + 1]):
+                if weights[edge] <= delta:
+                    light_edges.append(edge)
+                else:
+                    heavy_edges.append(edge)
+            light_indptr[u + 1] = len(light_edges)
+            heavy_indptr[u + 1] = len(heavy_edges)
+        
+        split = (delta, light_indptr, light_edges, heavy_indptr, heavy_edges)
+        self._delta_csr[optimize_by] = split
+        return split
     
     def city_count(self):
         """Get total number of cities"""
@@ -144,7 +486,7 @@ class Graph:
     
     def route_count(self):
         """Get total number of unique routes"""
-        return len(self.get_all_routes())
+        return len(self._unique_routes())
     
     def has_path(self, origin_name, destination_name):
         """
@@ -166,22 +508,21 @@ class Graph:
         if origin == destination:
             return True
         
-        visited = set()
-        queue = [origin]
+        # Cities are marked visited when enqueued, so each is queued once
+        visited = {origin}
+        queue = deque([origin])
         
         while queue:
-            current = queue.pop(0)
-            if current == destination:
-                return True
-            
-            if current in visited:
-                continue
-            
-            visited.add(current)
+            current = queue.popleft()
             
             for route in self.get_neighbors(current):
-                if route.destination not in visited:
-                    queue.append(route.destination)
+                neighbor = route.destination
+                if neighbor == destination:
+                    return True
+                
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    queue.append(neighbor)
         
         return False
     
@@ -203,7 +544,7 @@ class Graph:
         """
         return {
             'cities': [city.to_dict() for city in self.cities.values()],
-            'routes': [route.to_dict() for route in self.get_all_routes()]
+            'routes': [route.to_dict() for route in self._unique_routes()]
         }
     
     @classmethod
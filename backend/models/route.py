@@ -3,7 +3,9 @@ Route Model
 Represents a connection/edge between two cities
 """
 
-from city import City
+import sys
+
+from backend.models.city import City
 
 
 class Route:
@@ -18,6 +20,10 @@ class Route:
         bidirectional (bool): Whether route works both ways
     """
     
+    # Routes are the most numerous objects in a graph; slots keep them small
+    __slots__ = ('origin', 'destination', 'distance', 'cost', 'bidirectional',
+                 '_cost_per_km', '_endpoint_key')
+    
     def __init__(self, origin, destination, distance, cost, bidirectional=True):
         """
         Initialize a Route object.
@@ -52,6 +58,12 @@ class Route:
         self.distance = float(distance)
         self.cost = float(cost)
         self.bidirectional = bidirectional
+        
+        # Routes are not modified after construction, so derived values
+        # are computed once here instead of on every access
+        self._cost_per_km = round(self.cost / self.distance, 2)
+        # Unordered endpoint pair used to deduplicate A->B and B->A
+        self._endpoint_key = frozenset((origin._key, destination._key))
     
     def __str__(self):
         """String representation of the route"""
@@ -112,7 +124,7 @@ class Route:
         Returns:
             float: Cost efficiency (cost per km)
         """
-        return round(self.cost / self.distance, 2)
+        return self._cost_per_km
     
     def to_dict(self):
         """
@@ -147,6 +159,16 @@ class Route:
         origin_name = data['origin']
         destination_name = data['destination']
         
+        # A name that isn't a string can't match any city
+        if not isinstance(origin_name, str):
+            raise KeyError(f"Origin city '{origin_name}' not found")
+        if not isinstance(destination_name, str):
+            raise KeyError(f"Destination city '{destination_name}' not found")
+        
+        # Interned names match the City name keys by identity
+        origin_name = sys.intern(origin_name)
+        destination_name = sys.intern(destination_name)
+        
         if origin_name not in cities_dict:
             raise KeyError(f"Origin city '{origin_name}' not found")
         if destination_name not in cities_dict:
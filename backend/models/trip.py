@@ -3,8 +3,31 @@ Trip Model
 Represents the result of a path calculation
 """
 
-from city import City
-from route import Route
+from array import array
+from typing import NamedTuple
+from backend.models.city import City
+from backend.models.route import Route
+from backend.models._trip_kernels import summarize
+
+
+class Segment(NamedTuple):
+    """
+    One leg of a trip, as returned by Trip.get_detailed_route().
+    
+    Attributes:
+        step (int): 1-based position of the leg in the trip
+        from_city (str): Name of the city the leg starts from
+        to_city (str): Name of the city the leg ends at
+        distance (float): Distance in kilometers
+        cost (float): Travel cost
+        cost_per_km (float): Cost per kilometer, rounded to 2 decimals
+    """
+    step: int
+    from_city: str
+    to_city: str
+    distance: float
+    cost: float
+    cost_per_km: float
 
 
 class Trip:
@@ -17,11 +40,24 @@ class Trip:
         destination (City): Ending city
         path (list): List of City objects in the path
         routes (list): List of Route objects taken
+        _dist_arr (array): Distance of each segment, parallel to routes
+        _cost_arr (array): Cost of each segment, parallel to routes
+        _cost_per_km (list): Cost per km of each segment, parallel to routes
         total_distance (float): Total distance in kilometers
         total_cost (float): Total cost
         optimization_type (str): 'distance' or 'cost'
     """
     
+    # Trips are cached and returned in bulk; slots drop the per-instance dict
+    __slots__ = ('origin', 'destination', 'path', 'routes', 'total_distance',
+                 'total_cost', 'optimization_type', '_dist_arr', '_cost_arr',
+                 '_cost_per_km', '_path_names', '_segments', '_dict_cache',
+                 '_total_distance_r2', '_total_cost_r2')
+    
+    # Trips with at least this many segments are summarized by the Numba
+    # kernel when it is installed; shorter ones don't repay the call overhead
+    JIT_MIN_SEGMENTS = 64
+    
     def __init__(self, origin, destination, optimization_type='distance'):
         """
         Initialize a Trip object.
@@ -35,9 +71,11 @@ class Trip:
             TypeError: If cities are not City objects
             ValueError: If optimization_type is invalid
         """
-        if not isinstance(origin, City):
+        # Exact type checks: a Trip is built for every path query and
+        # City/Trip are never subclassed, so the isinstance() walk is skipped
+        if type(origin) is not City:
             raise TypeError("Origin must be a City object")
-        if not isinstance(destination, City):
+        if type(destination) is not City:
             raise TypeError("Destination must be a City object")
         
         if optimization_type not in ['distance', 'cost']:
@@ -47,8 +85,16 @@ class Trip:
         self.destination = destination
         self.path = []  # Will be filled by pathfinding algorithm
         self.routes = []  # Will be filled by pathfinding algorithm
+        self._dist_arr = array('d')  # Per-segment distances (SoA view of routes)
+        self._cost_arr = array('d')  # Per-segment costs (SoA view of routes)
+        self._cost_per_km = []  # Per-segment cost per km, filled by set_path
+        self._path_names = ()  # City names along the path, filled by set_path
+        self._segments = None  # get_detailed_route() result, built on first use
+        self._dict_cache = None  # to_dict() result, built on first use
         self.total_distance = 0.0
         self.total_cost = 0.0
+        self._total_distance_r2 = 0.0  # Totals rounded for display, set by set_path
+        self._total_cost_r2 = 0.0
         self.optimization_type = optimization_type
     
     def set_path(self, path, routes):
@@ -70,19 +116,42 @@ class Trip:
         
         self.path = path
         self.routes = routes
+        self._path_names = tuple(city.name for city in path)
+        self._segments = None
+        self._dict_cache = None
+        
+        # Segment weights are copied once into flat float arrays; totals and
+        # segment details read these instead of each Route's attributes
+        self._dist_arr = array('d', [route.distance for route in routes])
+        self._cost_arr = array('d', [route.cost for route in routes])
         
-        # Calculate totals
-        self.total_distance = sum(route.distance for route in routes)
-        self.total_cost = sum(route.cost for route in routes)
+        # Calculate totals and per-segment cost per km. The pure Python
+        # totals are sum() over the float arrays, a C loop with no
+        # per-route attribute lookups or generator frames
+        if summarize is not None and len(routes) >= self.JIT_MIN_SEGMENTS:
+            self.total_distance, self.total_cost, ratios = summarize(
+                self._dist_arr, self._cost_arr)
+            self._cost_per_km = [round(ratio, 2) for ratio in ratios]
+        else:
+            self.total_distance = sum(self._dist_arr)
+            self.total_cost = sum(self._cost_arr)
+            self._cost_per_km = [route.cost_per_km() for route in routes]
+        
+        # Rounded once here for get_summary and to_dict
+        self._total_distance_r2 = round(self.total_distance, 2)
+        self._total_cost_r2 = round(self.total_cost, 2)
     
     def get_path_names(self):
         """
         Get list of city names in the path.
         
+        The names are collected once by set_path; each call returns a new
+        list, since trips are shared through the PathFinder cache.
+        
         Returns:
             list: List of city names
         """
-        return [city.name for city in self.path]
+        return list(self._path_names)
     
     def get_number_of_stops(self):
         """
@@ -119,10 +188,10 @@ class Trip:
         return {
             'origin': self.origin.name,
             'destination': self.destination.name,
-            'path': self.get_path_names(),
+            'path': list(self._path_names),
             'stops': self.get_number_of_stops(),
-            'total_distance': round(self.total_distance, 2),
-            'total_cost': round(self.total_cost, 2),
+            'total_distance': self._total_distance_r2,
+            'total_cost': self._total_cost_r2,
             'optimized_by': self.optimization_type
         }
     
@@ -131,7 +200,7 @@ class Trip:
         if not self.is_valid():
             return f"No path found from {self.origin.name} to {self.destination.name}"
         
-        path_str = " -> ".join(self.get_path_names())
+        path_str = " -> ".join(self._path_names)
         return (f"Trip: {path_str}\n"
                 f"Distance: {self.total_distance:.2f} km\n"
                 f"Cost: ${self.total_cost:.2f}\n"
@@ -148,44 +217,51 @@ class Trip:
         """
         Convert trip to dictionary format.
         
+        A trip does not change after set_path, so the route dictionaries
+        are built once; each call returns fresh copies that callers may
+        modify.
+        
         Returns:
             dict: Dictionary representation of the trip
         """
-        return {
-            'origin': self.origin.name,
-            'destination': self.destination.name,
-            'path': self.get_path_names(),
-            'routes': [route.to_dict() for route in self.routes],
-            'total_distance': round(self.total_distance, 2),
-            'total_cost': round(self.total_cost, 2),
-            'stops': self.get_number_of_stops(),
-            'optimization_type': self.optimization_type,
-            'valid': self.is_valid()
-        }
+        if self._dict_cache is None:
+            self._dict_cache = {
+                'origin': self.origin.name,
+                'destination': self.destination.name,
+                'path': self._path_names,
+                'routes': tuple(route.to_dict() for route in self.routes),
+                'total_distance': self._total_distance_r2,
+                'total_cost': self._total_cost_r2,
+                'stops': self.get_number_of_stops(),
+                'optimization_type': self.optimization_type,
+                'valid': self.is_valid()
+            }
+        
+        data = self._dict_cache
+        return {**data, 'path': list(data['path']),
+                'routes': [dict(route) for route in data['routes']]}
     
     def get_detailed_route(self):
         """
         Get detailed information about each segment of the trip.
         
+        The segments are built on the first call after set_path and then
+        reused; each call returns a new list.
+        
         Returns:
-            list: List of dictionaries with segment details
+            list: List of Segment tuples; use Segment._asdict() for a dict
         """
         if not self.is_valid():
             return []
         
-        segments = []
-        for i, route in enumerate(self.routes):
-            segment = {
-                'step': i + 1,
-                'from': route.origin.name,
-                'to': route.destination.name,
-                'distance': route.distance,
-                'cost': route.cost,
-                'cost_per_km': route.cost_per_km()
-            }
-            segments.append(segment)
-        
-        return segments
+        if self._segments is None:
+            self._segments = tuple(
+                Segment(i + 1, route.origin.name, route.destination.name,
+                        distance, cost, cost_per_km)
+                for i, (route, distance, cost, cost_per_km) in enumerate(
+                    zip(self.routes, self._dist_arr, self._cost_arr, self._cost_per_km))
+            )
+        return list(self._segments)
     
     def compare_with(self, other_trip):
         """
@@ -197,15 +273,59 @@ class Trip:
         Returns:
             dict: Comparison results
         """
-        if not isinstance(other_trip, Trip):
+        if type(other_trip) is not Trip:
             raise TypeError("Can only compare with another Trip object")
         
+        comparison = Trip.compare_many([self], [other_trip])
+        return {key: values[0] for key, values in comparison.items()}
+    
+    @classmethod
+    def compare_many(cls, trips_a, trips_b):
+        """
+        Compare trips pairwise, like compare_with applied to each pair.
+        
+        Totals and stop counts are pulled into flat columns once, then
+        every comparison is a single pass over the zipped columns. A
+        one-trip list is broadcast against the other list, so a reference
+        trip can be compared with many candidates in one call.
+        
+        Args:
+            trips_a (list): Trip objects on the left of each comparison
+            trips_b (list): Trip objects on the right of each comparison
+            
+        Returns:
+            dict: Same keys as compare_with, each mapped to a list with
+                  one result per pair
+            
+        Raises:
+            TypeError: If any element is not a Trip object
+            ValueError: If the lists differ in length and neither has one trip
+        """
+        for trip in (*trips_a, *trips_b):
+            if type(trip) is not Trip:
+                raise TypeError("Can only compare with another Trip object")
+        
+        if len(trips_a) != len(trips_b):
+            if len(trips_a) == 1:
+                trips_a = trips_a * len(trips_b)
+            elif len(trips_b) == 1:
+                trips_b = trips_b * len(trips_a)
+            else:
+                raise ValueError("Trip lists must have the same length or a single trip")
+        
+        dist_a = [trip.total_distance for trip in trips_a]
+        dist_b = [trip.total_distance for trip in trips_b]
+        cost_a = [trip.total_cost for trip in trips_a]
+        cost_b = [trip.total_cost for trip in trips_b]
+        stops_a = [trip.get_number_of_stops() for trip in trips_a]
+        stops_b = [trip.get_number_of_stops() for trip in trips_b]
+        
         return {
-            'distance_difference': self.total_distance - other_trip.total_distance,
-            'cost_difference': self.total_cost - other_trip.total_cost,
-            'stops_difference': self.get_number_of_stops() - other_trip.get_number_of_stops(),
-            'this_trip_better_by_distance': self.total_distance < other_trip.total_distance,
-            'this_trip_better_by_cost': self.total_cost < other_trip.total_cost
+            'distance_difference': [a - b for a, b in zip(dist_a, dist_b)],
+            'cost_difference': [a - b for a, b in zip(cost_a, cost_b)],
+            'stops_difference': [a - b for a, b in zip(stops_a, stops_b)],
+            'this_trip_better_by_distance': [a < b for a, b in zip(dist_a, dist_b)],
+            'this_trip_better_by_cost': [a < b for a, b in zip(cost_a, cost_b)]
         }
 
 
@@ -235,8 +355,8 @@ if __name__ == "__main__":
     
     print("\n--- Detailed Route ---")
     for segment in trip.get_detailed_route():
-        print(f"Step {segment['step']}: {segment['from']} -> {segment['to']} "
-              f"({segment['distance']}km, ${segment['cost']}, ${segment['cost_per_km']}/km)")
+        print(f"Step {segment.step}: {segment.from_city} -> {segment.to_city} "
+              f"({segment.distance}km, ${segment.cost}, ${segment.cost_per_km}/km)")
     
     # Test invalid trip
     print("\n--- Invalid Trip ---")
@@ -0,0 +1,32 @@
+"""
+Shared Test Fixtures
+Cities used across the test modules, built once per test session
+"""
+
+import pytest
+
+from backend.models.city import City
+
+
+@pytest.fixture(scope="session")
+def delhi():
+    """Delhi; City objects are never modified by tests, so one is shared"""
+    return City("Delhi", 28.6139, 77.2090)
+
+
+@pytest.fixture(scope="session")
+def mumbai():
+    """Mumbai"""
+    return City("Mumbai", 19.0760, 72.8777)
+
+
+@pytest.fixture(scope="session")
+def bangalore():
+    """Bangalore"""
+    return City("Bangalore", 12.9716, 77.5946)
+
+
+@pytest.fixture(scope="session")
+def chennai():
+    """Chennai"""
+    return City("Chennai", 13.0827, 80.2707)
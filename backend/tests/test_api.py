@@ -5,22 +5,21 @@ Tests for FastAPI routes
 
 import pytest
 from fastapi.testclient import TestClient
-import sys
-import os
-
-# Add project root to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
+import main
 from main import app
 
-# Create test client
-client = TestClient(app)
+
+@pytest.fixture(scope="module")
+def client():
+    """Test client shared by every test in this module"""
+    return TestClient(app)
 
 
 class TestGeneralEndpoints:
     """Test general API endpoints"""
     
-    def test_root_endpoint(self):
+    def test_root_endpoint(self, client):
         """Test root endpoint returns API info"""
         response = client.get("/")
         assert response.status_code == 200
@@ -29,7 +28,7 @@ class TestGeneralEndpoints:
         assert "version" in data
         assert data["status"] == "running"
     
-    def test_health_check(self):
+    def test_health_check(self, client):
         """Test health check endpoint"""
         response = client.get("/health")
         assert response.status_code == 200
@@ -44,7 +43,7 @@ class TestGeneralEndpoints:
 class TestCityEndpoints:
     """Test city-related endpoints"""
     
-    def test_get_all_cities(self):
+    def test_get_all_cities(self, client):
         """Test getting all cities"""
         response = client.get("/cities")
         assert response.status_code == 200
@@ -58,7 +57,7 @@ class TestCityEndpoints:
         assert "latitude" in first_city
         assert "longitude" in first_city
     
-    def test_get_specific_city(self):
+    def test_get_specific_city(self, client):
         """Test getting a specific city"""
         response = client.get("/cities/New Delhi")
         assert response.status_code == 200
@@ -67,7 +66,27 @@ class TestCityEndpoints:
         assert isinstance(city["latitude"], float)
         assert isinstance(city["longitude"], float)
     
-    def test_get_nonexistent_city(self):
+    def test_cities_not_modified(self, client):
+        """Test that /cities supports conditional requests by ETag"""
+        etag = client.get("/cities").headers["etag"]
+        assert etag.startswith('W/"')
+        
+        response = client.get("/cities", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+    
+    def test_cities_not_modified_etag_forms(self, client):
+        """Test strong, listed and wildcard If-None-Match forms"""
+        etag = client.get("/cities").headers["etag"]
+        strong = etag.removeprefix("W/")
+        
+        for header in (strong, f'"stale", {etag}', f'W/"stale",{strong}', "*"):
+            response = client.get("/cities", headers={"If-None-Match": header})
+            assert response.status_code == 304
+        
+        response = client.get("/cities", headers={"If-None-Match": '"stale", W/"other"'})
+        assert response.status_code == 200
+    
+    def test_get_nonexistent_city(self, client):
         """Test getting a city that doesn't exist"""
         response = client.get("/cities/NonexistentCity")
         assert response.status_code == 404
@@ -78,7 +97,7 @@ class TestCityEndpoints:
 class TestRouteEndpoints:
     """Test route-related endpoints"""
     
-    def test_get_all_routes(self):
+    def test_get_all_routes(self, client):
         """Test getting all routes"""
         response = client.get("/routes")
         assert response.status_code == 200
@@ -94,7 +113,7 @@ class TestRouteEndpoints:
         assert "cost" in first_route
         assert "bidirectional" in first_route
     
-    def test_get_routes_from_city(self):
+    def test_get_routes_from_city(self, client):
         """Test getting routes from a specific city"""
         response = client.get("/routes/from/Mumbai")
         assert response.status_code == 200
@@ -105,7 +124,26 @@ class TestRouteEndpoints:
         for route in routes:
             assert route["origin"] == "Mumbai"
     
-    def test_get_routes_from_nonexistent_city(self):
+    def test_routes_not_modified(self, client):
+        """Test that a matching If-None-Match gets 304 without a body"""
+        etag = client.get("/routes").headers["etag"]
+        
+        response = client.get("/routes", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        
+        response = client.get("/routes", headers={"If-None-Match": '"stale"'})
+        assert response.status_code == 200
+        assert len(response.json()) > 0
+    
+    def test_routes_gzip(self, client):
+        """Test that the routes listing is compressed when accepted"""
+        response = client.get("/routes", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()) > 0
+    
+    def test_get_routes_from_nonexistent_city(self, client):
         """Test getting routes from a city that doesn't exist"""
         response = client.get("/routes/from/NonexistentCity")
         assert response.status_code == 404
@@ -114,7 +152,7 @@ class TestRouteEndpoints:
 class TestPathfindingEndpoints:
     """Test pathfinding endpoints"""
     
-    def test_find_path_by_distance(self):
+    def test_find_path_by_distance(self, client):
         """Test finding path optimized by distance"""
         request_data = {
             "origin": "New Delhi",
@@ -136,7 +174,7 @@ class TestPathfindingEndpoints:
         assert result["path"][0] == "New Delhi"
         assert result["path"][-1] == "Mumbai"
     
-    def test_find_path_by_cost(self):
+    def test_find_path_by_cost(self, client):
         """Test finding path optimized by cost"""
         request_data = {
             "origin": "New Delhi",
@@ -150,7 +188,7 @@ class TestPathfindingEndpoints:
         assert result["optimization_type"] == "cost"
         assert result["valid"] == True
     
-    def test_find_path_same_city(self):
+    def test_find_path_same_city(self, client):
         """Test finding path when origin and destination are the same"""
         request_data = {
             "origin": "Mumbai",
@@ -166,7 +204,7 @@ class TestPathfindingEndpoints:
         assert result["total_cost"] == 0
         assert len(result["path"]) == 1
     
-    def test_find_path_invalid_optimization(self):
+    def test_find_path_invalid_optimization(self, client):
         """Test finding path with invalid optimization type"""
         request_data = {
             "origin": "New Delhi",
@@ -178,7 +216,7 @@ class TestPathfindingEndpoints:
         error = response.json()
         assert "detail" in error
     
-    def test_find_path_nonexistent_origin(self):
+    def test_find_path_nonexistent_origin(self, client):
         """Test finding path with nonexistent origin city"""
         request_data = {
             "origin": "NonexistentCity",
@@ -188,7 +226,7 @@ class TestPathfindingEndpoints:
         response = client.post("/find-path", json=request_data)
         assert response.status_code == 404
     
-    def test_find_path_nonexistent_destination(self):
+    def test_find_path_nonexistent_destination(self, client):
         """Test finding path with nonexistent destination city"""
         request_data = {
             "origin": "Mumbai",
@@ -198,7 +236,7 @@ class TestPathfindingEndpoints:
         response = client.post("/find-path", json=request_data)
         assert response.status_code == 404
     
-    def test_path_segments(self):
+    def test_path_segments(self, client):
         """Test that path includes detailed segments"""
         request_data = {
             "origin": "New Delhi",
@@ -221,7 +259,35 @@ class TestPathfindingEndpoints:
             assert "distance" in first_segment
             assert "cost" in first_segment
     
-    def test_get_reachable_cities(self):
+    def test_startup_warms_find_path(self, client):
+        """Test that the startup warm-up queries are served from the cache"""
+        cities = main.graph.get_all_cities()
+        hits = main._find_path_json.cache_info().hits
+        
+        response = client.post("/find-path", json={
+            "origin": cities[0].name,
+            "destination": cities[-1].name,
+            "optimize_by": "cost"
+        })
+        assert response.status_code == 200
+        assert main._find_path_json.cache_info().hits == hits + 1
+    
+    def test_find_path_cache_ignores_spelling(self, client):
+        """Test that spellings of the same cities share one cached response"""
+        hits = main._find_path_json.cache_info().hits
+        
+        bodies = [
+            client.post("/find-path", json={
+                "origin": origin,
+                "destination": "Chennai",
+                "optimize_by": "distance"
+            }).content
+            for origin in ("New Delhi", " new delhi", "NEW DELHI ")
+        ]
+        assert bodies[0] == bodies[1] == bodies[2]
+        assert main._find_path_json.cache_info().hits >= hits + 2
+    
+    def test_get_reachable_cities(self, client):
         """Test getting reachable cities from a city"""
         response = client.get("/reachable/New Delhi")
         assert response.status_code == 200
@@ -231,7 +297,7 @@ class TestPathfindingEndpoints:
         assert len(reachable) > 0
         assert "New Delhi" not in reachable  # Origin not included
     
-    def test_get_reachable_from_nonexistent_city(self):
+    def test_get_reachable_from_nonexistent_city(self, client):
         """Test getting reachable cities from nonexistent city"""
         response = client.get("/reachable/NonexistentCity")
         assert response.status_code == 404
@@ -240,7 +306,7 @@ class TestPathfindingEndpoints:
 class TestPathOptimizationComparison:
     """Test comparing distance vs cost optimization"""
     
-    def test_distance_vs_cost_optimization(self):
+    def test_distance_vs_cost_optimization(self, client):
         """Test that distance and cost optimization may give different paths"""
         # Get path by distance
         distance_request = {
@@ -273,7 +339,7 @@ class TestPathOptimizationComparison:
 class TestAPIResponseFormat:
     """Test API response formats and data types"""
     
-    def test_city_response_format(self):
+    def test_city_response_format(self, client):
         """Test that city responses have correct format"""
         response = client.get("/cities")
         cities = response.json()
@@ -285,7 +351,7 @@ class TestAPIResponseFormat:
             assert -90 <= city["latitude"] <= 90
             assert -180 <= city["longitude"] <= 180
     
-    def test_route_response_format(self):
+    def test_route_response_format(self, client):
         """Test that route responses have correct format"""
         response = client.get("/routes")
         routes = response.json()
@@ -299,7 +365,7 @@ class TestAPIResponseFormat:
             assert route["distance"] > 0
             assert route["cost"] > 0
     
-    def test_path_response_format(self):
+    def test_path_response_format(self, client):
         """Test that path responses have correct format"""
         request_data = {
             "origin": "Mumbai",
@@ -2,49 +2,68 @@
 Unit Tests for Dijkstra's Algorithm
 """
 
+import copy
 import pytest
-import sys
-import os
 
-# Add parent directories to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'models'))
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'algorithms'))
+from backend.models.city import City
+from backend.models.route import Route
+from backend.models.graph import Graph
+from backend.models.trip import Trip
+from backend.algorithms.dijkstra import PathFinder
+from backend.utils.data_loader import DataLoader
 
-from city import City
-from route import Route
-from graph import Graph
-from trip import Trip
-from dijkstra import PathFinder
+
+@pytest.fixture(scope="module")
+def sample_graph(delhi, mumbai, bangalore, chennai):
+    """Create a sample graph shared by the tests that don't modify it"""
+    graph = Graph()
+    
+    # Create routes
+    routes = [
+        Route(delhi, mumbai, 1400, 5000),
+        Route(mumbai, bangalore, 980, 3500),
+        Route(bangalore, chennai, 350, 1500),
+        Route(delhi, bangalore, 2150, 6000),
+        Route(mumbai, chennai, 1340, 5500)
+    ]
+    
+    for route in routes:
+        graph.add_route(route)
+    graph.build_csr()
+    
+    version = graph._version
+    yield graph
+    
+    # The graph is shared read-only; tests that add to it must use
+    # mutable_sample_graph instead
+    assert graph._version == version, "sample_graph was modified by a test"
+
+
+@pytest.fixture
+def mutable_sample_graph(sample_graph):
+    """Private copy of the sample graph for tests that add to it"""
+    return copy.deepcopy(sample_graph)
+
+
+@pytest.fixture(scope="module")
+def loaded_graph():
+    """Load graph from data files once for the whole module"""
+    try:
+        graph = DataLoader.load_default_graph()
+        return graph
+    except FileNotFoundError:
+        pytest.skip("Data files not found")
+
+
+@pytest.fixture(scope="module")
+def loaded_pathfinder(loaded_graph):
+    """PathFinder over the loaded graph, shared by the module"""
+    return PathFinder(loaded_graph)
 
 
 class TestPathFinder:
     """Test cases for PathFinder (Dijkstra's Algorithm)"""
     
-    @pytest.fixture
-    def sample_graph(self):
-        """Create a sample graph for testing"""
-        graph = Graph()
-        
-        # Create cities
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
-        bangalore = City("Bangalore", 12.9716, 77.5946)
-        chennai = City("Chennai", 13.0827, 80.2707)
-        
-        # Create routes
-        routes = [
-            Route(delhi, mumbai, 1400, 5000),
-            Route(mumbai, bangalore, 980, 3500),
-            Route(bangalore, chennai, 350, 1500),
-            Route(delhi, bangalore, 2150, 6000),
-            Route(mumbai, chennai, 1340, 5500)
-        ]
-        
-        for route in routes:
-            graph.add_route(route)
-        
-        return graph
-    
     def test_create_pathfinder(self, sample_graph):
         """Test creating PathFinder instance"""
         pathfinder = PathFinder(sample_graph)
@@ -66,6 +85,16 @@ class TestPathFinder:
         assert trip.optimization_type == 'distance'
         assert trip.total_distance > 0
     
+    def test_shortest_path_is_optimal(self, sample_graph):
+        """Test that the search stops with the optimal destination distance"""
+        pathfinder = PathFinder(sample_graph)
+        trip = pathfinder.find_path("Delhi", "Chennai", optimize_by='distance')
+        
+        # Delhi -> Bangalore -> Chennai (2150 + 350) beats the direct-ish
+        # Delhi -> Mumbai -> Chennai (1400 + 1340)
+        assert trip.get_path_names() == ["Delhi", "Bangalore", "Chennai"]
+        assert trip.total_distance == 2500
+    
     def test_find_cheapest_path_by_cost(self, sample_graph):
         """Test finding cheapest path by cost"""
         pathfinder = PathFinder(sample_graph)
@@ -75,6 +104,70 @@ class TestPathFinder:
         assert trip.optimization_type == 'cost'
         assert trip.total_cost > 0
     
+    def test_delta_stepping(self):
+        """Test that delta-stepping finds the same optimal paths"""
+        graph = Graph()
+        a, b, c, d, e = (City(name, 0, 0) for name in 'ABCDE')
+        for route in [Route(a, b, 10, 100), Route(a, c, 50, 80), Route(b, d, 10, 100),
+                      Route(c, d, 10, 20), Route(d, e, 10, 100)]:
+            graph.add_route(route)
+        graph.build_csr()
+        
+        pathfinder = PathFinder(graph)
+        source, target = graph.city_ids[a], graph.city_ids[e]
+        expected = {'distance': ['A', 'B', 'D', 'E'], 'cost': ['A', 'C', 'D', 'E']}
+        for optimize_by, names in expected.items():
+            for stop_at in (target, -1):
+                previous, previous_edge = pathfinder._delta_stepping(source, stop_at, optimize_by)
+                path, _ = pathfinder._reconstruct(source, target, previous, previous_edge)
+                assert [city.name for city in path] == names
+    
+    def test_delta_stepping_dispatch(self, sample_graph, monkeypatch):
+        """Test that find_path runs delta-stepping only when DELTA_STEPPING is set"""
+        # Force the pure Python searches even when Numba is installed
+        monkeypatch.setattr("backend.algorithms.dijkstra.dijkstra_csr", None)
+        calls = []
+        delta_stepping = PathFinder._delta_stepping
+        
+        def spy(pathfinder, *args):
+            calls.append(args)
+            return delta_stepping(pathfinder, *args)
+        
+        monkeypatch.setattr(PathFinder, "_delta_stepping", spy)
+        
+        expected = PathFinder(sample_graph).find_path("Delhi", "Chennai")
+        assert calls == []
+        
+        pathfinder = PathFinder(sample_graph)
+        pathfinder.DELTA_STEPPING = True
+        trip = pathfinder.find_path("Delhi", "Chennai")
+        assert len(calls) == 1
+        assert trip.get_path_names() == expected.get_path_names()
+        assert trip.total_distance == expected.total_distance
+    
+    def test_bidirectional_search(self, mutable_sample_graph):
+        """Test that bidirectional Dijkstra finds the same optimal paths"""
+        graph = mutable_sample_graph
+        graph.add_route(Route(City("Pune", 18.5204, 73.8567), City("Goa", 15.2993, 74.1240),
+                              450, 1200, bidirectional=False))
+        graph.build_csr()
+        
+        pathfinder = PathFinder(graph)
+        n = len(graph.csr_cities)
+        for optimize_by in ('distance', 'cost'):
+            for source in range(n):
+                distances = pathfinder._shortest_path_tree(source, optimize_by)[0]
+                for target in range(n):
+                    if target == source:
+                        continue
+                    previous, previous_edge = pathfinder._bidirectional_search(
+                        source, target, optimize_by)
+                    if distances[target] == float('infinity'):
+                        assert previous[target] == -1
+                        continue
+                    _, routes = pathfinder._reconstruct(source, target, previous, previous_edge)
+                    assert sum(getattr(route, optimize_by) for route in routes) == distances[target]
+    
     def test_same_origin_destination(self, sample_graph):
         """Test path when origin and destination are same"""
         pathfinder = PathFinder(sample_graph)
@@ -85,17 +178,87 @@ class TestPathFinder:
         assert trip.total_distance == 0
         assert trip.total_cost == 0
     
-    def test_no_path_exists(self, sample_graph):
+    def test_no_path_exists(self, mutable_sample_graph):
         """Test when no path exists between cities"""
         # Add an isolated city
         isolated = City("Isolated", 0, 0)
-        sample_graph.add_city(isolated)
+        mutable_sample_graph.add_city(isolated)
         
-        pathfinder = PathFinder(sample_graph)
+        pathfinder = PathFinder(mutable_sample_graph)
         trip = pathfinder.find_path("Delhi", "Isolated", optimize_by='distance')
         
         assert trip.is_valid() == False
     
+    def test_repeated_queries(self, sample_graph):
+        """Test that reused search buffers give the same answers as fresh ones"""
+        pathfinder = PathFinder(sample_graph)
+        pairs = [("Delhi", "Chennai"), ("Chennai", "Mumbai"), ("Bangalore", "Delhi")]
+        
+        for origin, destination in pairs * 2:
+            for optimize_by in ('distance', 'cost'):
+                reused = pathfinder.find_path(origin, destination, optimize_by)
+                fresh = PathFinder(sample_graph).find_path(origin, destination, optimize_by)
+                assert reused.get_path_names() == fresh.get_path_names()
+        
+        forward, backward = pathfinder._scratch()
+        assert forward.touched == [] and backward.touched == []
+        assert set(forward.previous) == {-1}
+    
+    def test_repeated_origin_uses_cached_tree(self, sample_graph):
+        """Test that a repeated origin is answered from a cached tree"""
+        pathfinder = PathFinder(sample_graph)
+        pathfinder.find_path("Delhi", "Chennai")
+        pathfinder.find_path("Delhi", "Mumbai")
+        
+        delhi_id = sample_graph.city_ids[sample_graph.get_city("Delhi")]
+        assert pathfinder._tree_cache[(delhi_id, 'distance')] is not None
+        
+        trip = pathfinder.find_path("Delhi", "Bangalore")
+        assert trip.get_path_names() == ["Delhi", "Bangalore"]
+    
+    def test_repeated_query_returns_cached_trip(self, mutable_sample_graph):
+        """Test that identical queries are answered from the result cache"""
+        pathfinder = PathFinder(mutable_sample_graph)
+        trip = pathfinder.find_path("Delhi", "Chennai", optimize_by='cost')
+        
+        assert pathfinder.find_path("delhi", "CHENNAI", optimize_by='cost') is trip
+        assert pathfinder.find_path("Delhi", "Chennai") is not trip
+        
+        mutable_sample_graph.add_city(City("Pune", 18.5204, 73.8567))
+        assert pathfinder.find_path("Delhi", "Chennai", optimize_by='cost') is not trip
+    
+    def test_compute_all_pairs(self, sample_graph):
+        """Test that precomputed trees give the same paths as searches"""
+        pathfinder = PathFinder(sample_graph)
+        pathfinder.compute_all_pairs()
+        
+        names = ["Delhi", "Mumbai", "Bangalore", "Chennai"]
+        for origin in names:
+            for destination in names:
+                for optimize_by in ('distance', 'cost'):
+                    trip = pathfinder.find_path(origin, destination, optimize_by)
+                    fresh = PathFinder(sample_graph).find_path(origin, destination, optimize_by)
+                    assert trip.get_path_names() == fresh.get_path_names()
+                    assert trip.total_cost == fresh.total_cost
+        
+        assert not pathfinder._tree_cache  # Every query used a precomputed tree
+    
+    def test_tree_cache_invalidated_on_mutation(self):
+        """Test that cached trees and trips are dropped when the graph changes"""
+        graph = Graph()
+        a, b, c = City('A', 0, 0), City('B', 1, 1), City('C', 2, 2)
+        graph.add_route(Route(a, b, 10, 10))
+        graph.add_route(Route(b, c, 10, 10))
+        
+        pathfinder = PathFinder(graph)
+        pathfinder.find_path('A', 'C')
+        assert pathfinder.find_path('A', 'C').total_distance == 20
+        
+        graph.add_route(Route(a, c, 5, 5))
+        trip = pathfinder.find_path('A', 'C')
+        assert trip.get_path_names() == ['A', 'C']
+        assert trip.total_distance == 5
+    
     def test_invalid_city_names(self, sample_graph):
         """Test that invalid city names raise errors"""
         pathfinder = PathFinder(sample_graph)
@@ -141,6 +304,35 @@ class TestPathFinder:
         assert all_paths['by_distance'].is_valid() == True
         assert all_paths['by_cost'].is_valid() == True
     
+    def test_all_sources(self, sample_graph):
+        """Test batch shortest-path trees agree with single queries"""
+        pathfinder = PathFinder(sample_graph)
+        
+        for optimize_by in ('distance', 'cost'):
+            distances, predecessors = pathfinder.all_sources(optimize_by)
+            assert len(distances) == sample_graph.city_count()
+            
+            delhi_id = sample_graph.city_ids[sample_graph.get_city("Delhi")]
+            chennai_id = sample_graph.city_ids[sample_graph.get_city("Chennai")]
+            expected = pathfinder.find_path("Delhi", "Chennai", optimize_by)
+            trip = pathfinder.trip_from_predecessors(
+                predecessors[delhi_id], "Delhi", "Chennai", optimize_by
+            )
+            
+            assert trip.get_path_names() == expected.get_path_names()
+            assert distances[delhi_id][chennai_id] == (
+                expected.total_distance if optimize_by == 'distance' else expected.total_cost
+            )
+    
+    def test_all_sources_subset(self, sample_graph):
+        """Test all_sources with explicit origins and unknown cities"""
+        pathfinder = PathFinder(sample_graph)
+        distances, _ = pathfinder.all_sources('distance', sources=["Mumbai"])
+        assert len(distances) == 1
+        
+        with pytest.raises(ValueError):
+            pathfinder.all_sources('distance', sources=["InvalidCity"])
+    
     def test_get_reachable_cities(self, sample_graph):
         """Test getting all reachable cities from origin"""
         pathfinder = PathFinder(sample_graph)
@@ -172,6 +364,23 @@ class TestPathFinder:
         assert trip2.is_valid() == True
         assert trip1.total_distance == trip2.total_distance
     
+    def test_one_way_routes(self):
+        """Test that searches respect one-way routes in both directions"""
+        graph = Graph()
+        a, b, c = City('A', 0, 0), City('B', 1, 1), City('C', 2, 2)
+        graph.add_route(Route(a, b, 10, 10, bidirectional=False))
+        graph.add_route(Route(b, c, 10, 10, bidirectional=False))
+        graph.add_route(Route(c, a, 100, 100, bidirectional=False))
+        
+        pathfinder = PathFinder(graph)
+        forward = pathfinder.find_path('A', 'C')
+        backward = pathfinder.find_path('C', 'B')
+        
+        assert forward.get_path_names() == ['A', 'B', 'C']
+        assert forward.total_distance == 20
+        assert backward.get_path_names() == ['C', 'A', 'B']
+        assert backward.total_distance == 110
+    
     def test_complex_network(self):
         """Test pathfinding in a more complex network"""
         graph = Graph()
@@ -215,37 +424,57 @@ class TestPathFinder:
         assert trip_cost.total_cost < trip_dist.total_cost
 
 
-class TestPathFinderWithRealData:
-    """Test PathFinder with loaded data from JSON files"""
+class TestNumbaKernel:
+    """Test cases for the optional Numba Dijkstra kernel"""
     
-    @pytest.fixture
-    def loaded_graph(self):
-        """Load graph from data files"""
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'utils'))
-        from data_loader import DataLoader
+    def test_kernel_matches_python_search(self):
+        """Test that the JIT kernel finds the same predecessors as pure Python"""
+        pytest.importorskip("numba")
+        graph = Graph()
+        a, b, c, d = City('A', 0, 0), City('B', 1, 1), City('C', 2, 2), City('D', 3, 3)
+        for route in [Route(a, b, 10, 100), Route(a, c, 50, 80),
+                      Route(b, d, 10, 100), Route(c, d, 10, 20)]:
+            graph.add_route(route)
+        graph.build_csr()
         
-        try:
-            graph = DataLoader.load_default_graph()
-            return graph
-        except FileNotFoundError:
-            pytest.skip("Data files not found")
+        pathfinder = PathFinder(graph)
+        source, target = graph.city_ids[a], graph.city_ids[d]
+        for optimize_by in ('distance', 'cost'):
+            jit_prev, jit_edge = pathfinder._search_jit(source, target, optimize_by)
+            py_prev, py_edge = pathfinder._search(source, target, optimize_by)
+            assert jit_prev[target] == py_prev[target]
+            assert jit_edge[target] == py_edge[target]
+
+
+class TestPathFinderWithRealData:
+    """Test PathFinder with loaded data from JSON files"""
     
-    def test_pathfinding_with_real_data(self, loaded_graph):
+    def test_pathfinding_with_real_data(self, loaded_pathfinder):
         """Test pathfinding with real Indian cities data"""
-        pathfinder = PathFinder(loaded_graph)
-        
         # Test a known path
-        trip = pathfinder.find_path("New Delhi", "Kochi", optimize_by='distance')
+        trip = loaded_pathfinder.find_path("New Delhi", "Kochi", optimize_by='distance')
         
         assert trip.is_valid() == True
         assert trip.total_distance > 0
         assert trip.total_cost > 0
         assert len(trip.path) >= 2
     
-    def test_all_cities_reachable(self, loaded_graph):
+    def test_default_graph_reuses_parsed_data(self, loaded_graph):
+        """Test that reloads skip parsing but never share a Graph"""
+        hits = DataLoader._read_data_cached.cache_info().hits
+        graph = DataLoader.load_default_graph()
+        
+        assert DataLoader._read_data_cached.cache_info().hits == hits + 1
+        assert graph is not loaded_graph
+        assert graph.city_count() == loaded_graph.city_count()
+        
+        graph.add_city(City("Shimla", 31.1048, 77.1734))
+        assert loaded_graph.get_city("Shimla") is None
+        assert DataLoader.load_default_graph().get_city("Shimla") is None
+    
+    def test_all_cities_reachable(self, loaded_pathfinder):
         """Test that all cities in the network are reachable from Delhi"""
-        pathfinder = PathFinder(loaded_graph)
-        reachable = pathfinder.get_reachable_cities("New Delhi")
+        reachable = loaded_pathfinder.get_reachable_cities("New Delhi")
         
         # Should have multiple reachable cities
         assert len(reachable) > 5
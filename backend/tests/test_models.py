@@ -2,17 +2,13 @@
 Unit Tests for Models (City, Route, Graph, Trip)
 """
 
+import math
 import pytest
-import sys
-import os
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'models'))
-
-from city import City
-from route import Route
-from graph import Graph
-from trip import Trip
+from backend.models.city import City, EARTH_RADIUS_KM
+from backend.models.route import Route
+from backend.models.graph import Graph
+from backend.models.trip import Trip
 
 
 class TestCity:
@@ -47,6 +43,13 @@ class TestCity:
         assert city1 == city2
         assert city1 != city3
     
+    def test_city_name_is_interned(self):
+        """Test that equal city names share one string object"""
+        city1 = City(" Delhi ", 28.6139, 77.2090)
+        city2 = City("Delhi", 28.6139, 77.2090)
+        
+        assert city1.name is city2.name
+    
     def test_city_hashable(self):
         """Test that cities can be used in sets and dicts"""
         city1 = City("Delhi", 28.6139, 77.2090)
@@ -58,15 +61,35 @@ class TestCity:
         city_dict = {city1: "Capital", city2: "Financial"}
         assert city_dict[city1] == "Capital"
     
-    def test_distance_calculation(self):
-        """Test distance calculation between cities"""
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
+    def test_city_has_no_instance_dict(self):
+        """Test that City uses __slots__ and rejects ad-hoc attributes"""
+        city = City("Delhi", 28.6139, 77.2090)
         
+        assert not hasattr(city, '__dict__')
+        with pytest.raises(AttributeError):
+            city.population = 1
+    
+    def test_distance_calculation(self, delhi, mumbai):
+        """Test distance calculation between cities"""
         distance = delhi.distance_to(mumbai)
         assert isinstance(distance, float)
         assert 1100 < distance < 1200  # Approximate real distance
     
+    def test_distance_antipodal(self):
+        """Test that antipodal cities are half the Earth's circumference apart"""
+        city = City("A", -73.10527438063772, -174.89745422603886)
+        antipode = City("B", 73.10527438063772, 5.10254577396114)
+        
+        assert city.distance_to(antipode) == round(EARTH_RADIUS_KM * math.pi, 2)
+        assert City.haversine_matrix([city, antipode])[0][1] == city.distance_to(antipode)
+    
+    def test_haversine_matrix(self, delhi, mumbai, chennai):
+        """Test pairwise distance matrix matches distance_to"""
+        matrix = City.haversine_matrix([delhi, mumbai, chennai])
+        assert matrix[0][0] == 0.0
+        assert matrix[0][1] == matrix[1][0] == delhi.distance_to(mumbai)
+        assert matrix[1][2] == mumbai.distance_to(chennai)
+    
     def test_to_dict(self):
         """Test city to dictionary conversion"""
         city = City("Chennai", 13.0827, 80.2707)
@@ -88,10 +111,8 @@ class TestCity:
 class TestRoute:
     """Test cases for Route class"""
     
-    def test_create_route_valid(self):
+    def test_create_route_valid(self, delhi, mumbai):
         """Test creating a valid route"""
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
         route = Route(delhi, mumbai, 1400, 5000)
         
         assert route.origin == delhi
@@ -100,28 +121,21 @@ class TestRoute:
         assert route.cost == 5000
         assert route.bidirectional == True
     
-    def test_create_route_invalid_cities(self):
+    def test_create_route_invalid_cities(self, delhi):
         """Test that same origin/destination raises error"""
-        delhi = City("Delhi", 28.6139, 77.2090)
-        
         with pytest.raises(ValueError):
             Route(delhi, delhi, 100, 500)
     
-    def test_create_route_negative_values(self):
+    def test_create_route_negative_values(self, delhi, mumbai):
         """Test that negative distance/cost raise errors"""
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
-        
         with pytest.raises(ValueError):
             Route(delhi, mumbai, -100, 500)
         
         with pytest.raises(ValueError):
             Route(delhi, mumbai, 100, -500)
     
-    def test_route_reverse(self):
+    def test_route_reverse(self, delhi, mumbai):
         """Test getting reverse route"""
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
         route = Route(delhi, mumbai, 1400, 5000)
         
         reverse = route.get_reverse()
@@ -130,13 +144,24 @@ class TestRoute:
         assert reverse.distance == 1400
         assert reverse.cost == 5000
     
-    def test_cost_per_km(self):
+    def test_cost_per_km(self, delhi, mumbai):
         """Test cost per kilometer calculation"""
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
         route = Route(delhi, mumbai, 1400, 5600)
         
         assert route.cost_per_km() == 4.0
+    
+    def test_route_from_dict(self, delhi, mumbai):
+        """Test route creation from a dictionary and bad city names"""
+        cities = {delhi.name: delhi, mumbai.name: mumbai}
+        data = {'origin': "Delhi", 'destination': "Mumbai", 'distance': 1400, 'cost': 5000}
+        
+        route = Route.from_dict(data, cities)
+        assert route.origin is delhi
+        assert route.destination is mumbai
+        
+        for bad_name in ("Chennai", None, ["Mumbai"]):
+            with pytest.raises(KeyError):
+                Route.from_dict({**data, 'destination': bad_name}, cities)
 
 
 class TestGraph:
@@ -148,41 +173,58 @@ class TestGraph:
         assert graph.city_count() == 0
         assert graph.route_count() == 0
     
-    def test_add_city(self):
+    def test_add_city(self, delhi):
         """Test adding cities to graph"""
         graph = Graph()
-        delhi = City("Delhi", 28.6139, 77.2090)
         
         graph.add_city(delhi)
         assert graph.city_count() == 1
         assert graph.get_city("Delhi") == delhi
     
-    def test_add_duplicate_city(self):
+    def test_add_duplicate_city(self, delhi):
         """Test that adding duplicate city raises error"""
         graph = Graph()
-        delhi = City("Delhi", 28.6139, 77.2090)
         
         graph.add_city(delhi)
         with pytest.raises(ValueError):
             graph.add_city(delhi)
+        with pytest.raises(ValueError):
+            graph.add_city(City("DELHI", 28.6139, 77.2090))
     
-    def test_add_route(self):
+    def test_get_city_case_insensitive(self):
+        """Test that city lookup ignores case like City equality does"""
+        graph = Graph()
+        delhi = City("New Delhi", 28.6139, 77.2090)
+        graph.add_city(delhi)
+        
+        assert graph.get_city("new delhi") is delhi
+        assert graph.get_city("NEW DELHI") is delhi
+        assert graph.get_city("Mumbai") is None
+        assert graph.get_city(None) is None
+    
+    def test_add_route(self, delhi, mumbai):
         """Test adding routes to graph"""
         graph = Graph()
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
         route = Route(delhi, mumbai, 1400, 5000)
         
         graph.add_route(route)
         assert graph.city_count() == 2
         assert graph.route_count() == 1
     
-    def test_get_neighbors(self):
+    def test_route_count_after_mutation(self, delhi, mumbai, bangalore):
+        """Test that cached unique routes are refreshed when routes are added"""
+        graph = Graph()
+        
+        graph.add_route(Route(delhi, mumbai, 1400, 5000))
+        assert graph.route_count() == 1
+        
+        graph.add_route(Route(mumbai, bangalore, 980, 4000))
+        assert graph.route_count() == 2
+        assert len(graph.get_all_routes()) == 2
+    
+    def test_get_neighbors(self, delhi, mumbai, bangalore):
         """Test getting neighbors of a city"""
         graph = Graph()
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
-        bangalore = City("Bangalore", 12.9716, 77.5946)
         
         route1 = Route(delhi, mumbai, 1400, 5000)
         route2 = Route(delhi, bangalore, 2150, 8000)
@@ -193,12 +235,9 @@ class TestGraph:
         neighbors = graph.get_neighbors(delhi)
         assert len(neighbors) == 2
     
-    def test_has_path(self):
+    def test_has_path(self, delhi, mumbai, bangalore):
         """Test checking if path exists between cities"""
         graph = Graph()
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
-        bangalore = City("Bangalore", 12.9716, 77.5946)
         isolated = City("Isolated", 0, 0)
         
         route1 = Route(delhi, mumbai, 1400, 5000)
@@ -211,34 +250,118 @@ class TestGraph:
         assert graph.has_path("Delhi", "Bangalore") == True
         assert graph.has_path("Delhi", "Isolated") == False
 
+    def test_component_of(self, delhi, mumbai, bangalore):
+        """Test connected components are merged as routes are added"""
+        graph = Graph()
+        
+        graph.add_city(delhi)
+        graph.add_city(bangalore)
+        graph.add_route(Route(delhi, mumbai, 1400, 5000))
+        assert graph.component_of(delhi) == graph.component_of("mumbai")
+        assert graph.component_of(delhi) != graph.component_of(bangalore)
+        
+        graph.add_route(Route(bangalore, mumbai, 980, 4000, bidirectional=False))
+        assert graph.component_of(delhi) == graph.component_of(bangalore)
+        assert graph.component_of("Unknown") is None
+        assert graph.component_of(None) is None
+        assert graph.component_of(42) is None
+
+    def test_build_columns(self, delhi, mumbai, bangalore):
+        """Test the column view of cities and unique routes"""
+        graph = Graph()
+        graph.add_route(Route(delhi, mumbai, 1400, 5000))
+        graph.add_route(Route(mumbai, bangalore, 980, 4000, bidirectional=False))
+        graph.build_columns()
+
+        assert graph.city_names == ["Delhi", "Mumbai", "Bangalore"]
+        assert list(graph.city_lat) == [28.6139, 19.0760, 12.9716]
+        assert list(graph.route_src) == [0, 1]
+        assert list(graph.route_dst) == [1, 2]
+        assert list(graph.route_cost) == [5000.0, 4000.0]
+        assert graph.route_bidirectional == [True, False]
+
+        graph.add_city(City("Chennai", 13.0827, 80.2707))
+        graph.build_columns()
+        assert len(graph.city_lon) == 4
+
+    def test_distance_matrix(self, delhi, mumbai):
+        """Test the cached pairwise distance matrix follows city order"""
+        graph = Graph()
+        graph.add_cities([delhi, mumbai])
+
+        matrix = graph.distance_matrix()
+        assert matrix[0][1] == delhi.distance_to(mumbai)
+        assert graph.distance_matrix() is matrix
+
+        graph.add_city(City("Chennai", 13.0827, 80.2707))
+        assert len(graph.distance_matrix()) == 3
+
+    def test_bulk_add(self, delhi, mumbai, bangalore):
+        """Test adding cities and routes in batches"""
+        graph = Graph()
+
+        graph.add_cities([delhi, mumbai])
+        graph.add_routes([Route(delhi, mumbai, 1400, 5000),
+                          Route(mumbai, bangalore, 980, 4000, bidirectional=False)])
+
+        assert graph.city_count() == 3  # Bangalore added automatically
+        assert graph.route_count() == 2
+        assert len(graph.get_neighbors(mumbai)) == 2
+        assert graph.component_of(delhi) == graph.component_of(bangalore)
+
+    def test_bulk_add_is_atomic(self):
+        """Test that a rejected batch leaves the graph unchanged"""
+        graph = Graph()
+        graph.add_city(City("Delhi", 28.6139, 77.2090))
+
+        with pytest.raises(ValueError):
+            graph.add_cities([City("Mumbai", 19.0760, 72.8777), City("DELHI", 0, 0)])
+        with pytest.raises(ValueError):
+            graph.add_cities([City("Pune", 18.5204, 73.8567), City("Pune", 0, 0)])
+        with pytest.raises(TypeError):
+            graph.add_routes(["not a route"])
+
+        assert graph.city_count() == 1
+
+    def test_build_csr(self, delhi, mumbai, bangalore):
+        """Test CSR view of the adjacency list and its invalidation"""
+        graph = Graph()
+
+        graph.add_route(Route(delhi, mumbai, 1400, 5000))
+        graph.add_route(Route(mumbai, bangalore, 980, 4000, bidirectional=False))
+        graph.build_csr()
+
+        mumbai_id = graph.city_ids[mumbai]
+        start, end = graph.csr_indptr[mumbai_id], graph.csr_indptr[mumbai_id + 1]
+        assert len(graph.csr_cities) == 3
+        assert end - start == 2
+        assert graph.csr_dist_w[start:end] == [980.0, 1400.0]  # Sorted by distance
+        assert graph.csr == (graph.csr_indptr, graph.csr_neighbors,
+                             graph.csr_dist_w, graph.csr_cost_w)
+
+        graph.add_city(City("Isolated", 0, 0))
+        graph.build_csr()
+        assert len(graph.csr_cities) == 4
+        assert graph.csr_indptr[-1] == len(graph.csr_neighbors) == 3
+
 
 class TestTrip:
     """Test cases for Trip class"""
     
-    def test_create_trip(self):
+    def test_create_trip(self, delhi, mumbai):
         """Test creating a trip"""
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
-        
         trip = Trip(delhi, mumbai, optimization_type='distance')
         assert trip.origin == delhi
         assert trip.destination == mumbai
         assert trip.optimization_type == 'distance'
     
-    def test_trip_invalid_optimization(self):
+    def test_trip_invalid_optimization(self, delhi, mumbai):
         """Test that invalid optimization type raises error"""
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
-        
         with pytest.raises(ValueError):
             Trip(delhi, mumbai, optimization_type='invalid')
     
-    def test_set_path(self):
+    def test_set_path(self, delhi, mumbai, bangalore):
         """Test setting path in trip"""
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
-        bangalore = City("Bangalore", 12.9716, 77.5946)
-        
         trip = Trip(delhi, bangalore)
         path = [delhi, mumbai, bangalore]
         routes = [
@@ -250,13 +373,21 @@ class TestTrip:
         assert len(trip.path) == 3
         assert trip.total_distance == 2380
         assert trip.total_cost == 9000
+        assert trip.get_path_names() == ["Delhi", "Mumbai", "Bangalore"]
+        
+        # Results are copies, so callers can't change the shared trip
+        trip.get_path_names().append("Chennai")
+        trip.to_dict()['path'].append("Chennai")
+        trip.to_dict()['routes'][0]['distance'] = 0
+        assert trip.get_path_names() == ["Delhi", "Mumbai", "Bangalore"]
+        assert trip.to_dict()['path'] == ["Delhi", "Mumbai", "Bangalore"]
+        assert trip.to_dict()['routes'][0]['distance'] == 1400
+        
+        trip.set_path([delhi, bangalore], [Route(delhi, bangalore, 2150, 6000)])
+        assert trip.to_dict()['total_distance'] == 2150
     
-    def test_get_number_of_stops(self):
+    def test_get_number_of_stops(self, delhi, mumbai, bangalore):
         """Test calculating number of stops"""
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
-        bangalore = City("Bangalore", 12.9716, 77.5946)
-        
         trip = Trip(delhi, bangalore)
         path = [delhi, mumbai, bangalore]
         routes = [
@@ -267,11 +398,8 @@ class TestTrip:
         trip.set_path(path, routes)
         assert trip.get_number_of_stops() == 1  # One intermediate stop
     
-    def test_trip_is_valid(self):
+    def test_trip_is_valid(self, delhi, mumbai):
         """Test checking if trip is valid"""
-        delhi = City("Delhi", 28.6139, 77.2090)
-        mumbai = City("Mumbai", 19.0760, 72.8777)
-        
         trip = Trip(delhi, mumbai)
         assert trip.is_valid() == False  # No path set yet
         
@@ -280,6 +408,70 @@ class TestTrip:
         trip.set_path(path, routes)
         
         assert trip.is_valid() == True
+    
+    def test_trip_has_no_instance_dict(self):
+        """Test that Trip uses slots instead of a per-instance dict"""
+        trip = Trip(City("Delhi", 28.6139, 77.2090), City("Mumbai", 19.0760, 72.8777))
+        assert not hasattr(trip, '__dict__')
+        
+        with pytest.raises(AttributeError):
+            trip.notes = "ad-hoc"
+    
+    def test_compare_many(self, delhi, mumbai, bangalore):
+        """Test pairwise comparison with broadcasting of a single trip"""
+        direct = Trip(delhi, bangalore)
+        direct.set_path([delhi, bangalore], [Route(delhi, bangalore, 2150, 6000)])
+        via_mumbai = Trip(delhi, bangalore)
+        via_mumbai.set_path(
+            [delhi, mumbai, bangalore],
+            [Route(delhi, mumbai, 1400, 5000), Route(mumbai, bangalore, 980, 4000)]
+        )
+        
+        result = Trip.compare_many([direct], [via_mumbai, direct])
+        assert result['distance_difference'] == [-230.0, 0.0]
+        assert result['stops_difference'] == [-1, 0]
+        assert result['this_trip_better_by_cost'] == [True, False]
+        assert direct.compare_with(via_mumbai)['cost_difference'] == -3000.0
+        
+        with pytest.raises(ValueError):
+            Trip.compare_many([direct, direct], [via_mumbai, direct, direct])
+        with pytest.raises(TypeError):
+            Trip.compare_many([direct], ["not a trip"])
+    
+    def test_detailed_route(self, delhi, mumbai, bangalore):
+        """Test per-segment details read from the segment arrays"""
+        trip = Trip(delhi, bangalore)
+        trip.set_path(
+            [delhi, mumbai, bangalore],
+            [Route(delhi, mumbai, 1400, 5000), Route(mumbai, bangalore, 980, 4000)]
+        )
+        
+        segments = trip.get_detailed_route()
+        assert [s.distance for s in segments] == [1400.0, 980.0]
+        assert [s.cost for s in segments] == [5000.0, 4000.0]
+        assert segments[1].from_city == "Mumbai"
+        assert segments[1].cost_per_km == 4.08
+        assert segments[0]._asdict()['to_city'] == "Mumbai"
+        
+        segments.pop()
+        assert len(trip.get_detailed_route()) == 2  # Callers get a copy
+    
+    def test_jit_summary_matches_python(self, monkeypatch):
+        """Test that the JIT summary gives the same totals and ratios"""
+        pytest.importorskip("numba")
+        cities = [City(f"C{i}", i * 0.1, i * 0.1) for i in range(80)]
+        routes = [Route(a, b, 10 + i * 0.7, 30 + i * 1.3)
+                  for i, (a, b) in enumerate(zip(cities, cities[1:]))]
+        
+        jit_trip = Trip(cities[0], cities[-1])
+        jit_trip.set_path(cities, routes)
+        monkeypatch.setattr(Trip, 'JIT_MIN_SEGMENTS', len(routes) + 1)
+        py_trip = Trip(cities[0], cities[-1])
+        py_trip.set_path(cities, routes)
+        
+        assert jit_trip.total_distance == pytest.approx(py_trip.total_distance)
+        assert jit_trip.total_cost == pytest.approx(py_trip.total_cost)
+        assert jit_trip.get_detailed_route() == py_trip.get_detailed_route()
 
 
 if __name__ == "__main__":
@@ -3,13 +3,52 @@ Data Loader Utility
 Loads cities and routes from JSON files into Graph
 """
 
+import functools
 import json
 import os
-import sys
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'models'))
-from graph import Graph 
-from city import City
-from route import Route
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from backend.models.graph import Graph
+from backend.models.city import City
+from backend.models.route import Route
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
+
+
+def _read_json(path):
+    """Parse a JSON file, with orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _read_json_files(*paths):
+    """
+    Parse several JSON files, reading them concurrently.
+    
+    File reads release the GIL, so on a cold page cache the disk I/O of
+    the files overlaps instead of running back to back.
+    
+    Returns:
+        list: Parsed contents, in the same order as paths
+    """
+    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+        return list(executor.map(_read_json, paths))
+
+
+def _write_json(data, path):
+    """Write data as JSON indented by 2 spaces, with orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
 
 
 class DataLoader:
@@ -22,6 +61,11 @@ class DataLoader:
         """
         Load a complete graph from JSON files.
         
+        Parsed file contents are cached in-process by file path and
+        modification time, so repeated loads of unchanged files skip the
+        disk reads and JSON parsing. Every call still builds a new Graph,
+        which the caller may modify freely.
+        
         Args:
             cities_file (str): Path to cities JSON file
             routes_file (str): Path to routes JSON file
@@ -39,29 +83,37 @@ class DataLoader:
         if not os.path.exists(routes_file):
             raise FileNotFoundError(f"Routes file not found: {routes_file}")
         
-        # Load cities
-        with open(cities_file, 'r', encoding='utf-8') as f:
-            cities_data = json.load(f)
-        
-        # Load routes
-        with open(routes_file, 'r', encoding='utf-8') as f:
-            routes_data = json.load(f)
+        # Editing either file changes its mtime and therefore the cache key
+        cities_data, routes_data = DataLoader._read_data_cached(
+            os.path.abspath(cities_file), os.stat(cities_file).st_mtime_ns,
+            os.path.abspath(routes_file), os.stat(routes_file).st_mtime_ns
+        )
         
         # Create graph
         graph = Graph()
         
-        # Add cities to graph
-        for city_data in cities_data:
-            city = City.from_dict(city_data)
-            graph.add_city(city)
+        # Add cities and routes in two batches
+        graph.add_cities([City.from_dict(city_data) for city_data in cities_data])
+        graph.add_routes([Route.from_dict(route_data, graph.cities)
+                          for route_data in routes_data])
         
-        # Add routes to graph
-        for route_data in routes_data:
-            route = Route.from_dict(route_data, graph.cities)
-            graph.add_route(route)
+        # Loaded graphs are searched right away, so build the CSR view now
+        # rather than on the first query
+        graph.build_csr()
         
         return graph
     
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _read_data_cached(cities_file, cities_mtime, routes_file, routes_mtime):
+        """
+        Parse both files; memoized by load_graph_from_files.
+        
+        The parsed lists are shared between calls and must not be modified.
+        Only the Graph built from them is returned to callers.
+        """
+        return tuple(_read_json_files(cities_file, routes_file))
+    
     @staticmethod
     def load_default_graph():
         """
@@ -92,13 +144,9 @@ class DataLoader:
         """
         graph_dict = graph.to_dict()
         
-        # Save cities
-        with open(cities_file, 'w', encoding='utf-8') as f:
-            json.dump(graph_dict['cities'], f, indent=2)
-        
-        # Save routes
-        with open(routes_file, 'w', encoding='utf-8') as f:
-            json.dump(graph_dict['routes'], f, indent=2)
+        # Save cities and routes
+        _write_json(graph_dict['cities'], cities_file)
+        _write_json(graph_dict['routes'], routes_file)
     
     @staticmethod
     def validate_data(cities_data, routes_data):
@@ -122,15 +170,17 @@ class DataLoader:
         
         # Check for duplicate cities
         city_names = [city['name'] for city in cities_data]
-        if len(city_names) != len(set(city_names)):
-            duplicates = [name for name in city_names if city_names.count(name) > 1]
+        city_name_set = set(city_names)
+        if len(city_names) != len(city_name_set):
+            # One counting pass instead of list.count() per name
+            duplicates = [name for name, count in Counter(city_names).items() if count > 1]
             errors.append(f"Duplicate cities found: {set(duplicates)}")
         
-        # Check if routes reference existing cities
+        # Check if routes reference existing cities (set lookups, not list scans)
         for route in routes_data:
-            if route['origin'] not in city_names:
+            if route['origin'] not in city_name_set:
                 errors.append(f"Route references unknown origin city: {route['origin']}")
-            if route['destination'] not in city_names:
+            if route['destination'] not in city_name_set:
                 errors.append(f"Route references unknown destination city: {route['destination']}")
         
         return {
@@ -141,10 +191,7 @@ class DataLoader:
 
 # Example usage and testing
 if __name__ == "__main__":
-    import sys
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
-    
-    from algorithms.dijkstra import PathFinder
+    from backend.algorithms.dijkstra import PathFinder
     
     print("=== Loading Graph from Data Files ===\n")
     
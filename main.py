@@ -3,15 +3,19 @@ Travel Route Optimizer API
 FastAPI application for route calculation
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 from typing import List, Dict, Optional
-import sys
-import os
+from functools import lru_cache
+import hashlib
+import json
 
-# Add backend to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on installed extras
+    orjson = None
 
 from backend.utils.data_loader import DataLoader
 from backend.algorithms.dijkstra import PathFinder
@@ -32,10 +36,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON bodies such as /cities and /routes
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 # Load graph data on startup
 try:
     graph = DataLoader.load_default_graph()
     pathfinder = PathFinder(graph)
+    # The dataset is small, so every query becomes a path lookup
+    pathfinder.compute_all_pairs()
     print(f"✅ Graph loaded: {graph.city_count()} cities, {graph.route_count()} routes")
 except Exception as e:
     print(f"❌ Error loading graph: {e}")
@@ -43,7 +52,10 @@ except Exception as e:
     pathfinder = None
 
 
-# Pydantic models for request/response validation
+# Pydantic models for request validation and the OpenAPI schema.
+# Responses are encoded from plain dicts and returned as bytes; the data
+# endpoints list these models under `responses` rather than `response_model`
+# so FastAPI documents them without validating each response.
 class CityResponse(BaseModel):
     name: str
     latitude: float
@@ -89,6 +101,174 @@ class ErrorResponse(BaseModel):
     detail: Optional[str] = None
 
 
+def _dump_json(data):
+    """Serialize data to JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+def _build_data_responses(graph):
+    """
+    Serialize the read-only city and route listings once.
+    
+    The graph is not modified after startup, so the /cities, /cities/{name},
+    /routes and /routes/from/{name} bodies are fixed and can be sent
+    without per-request model construction or encoding.
+    
+    Returns:
+        tuple: (cities JSON, routes JSON, {lowercased city name: city JSON},
+               {lowercased city name: outgoing routes JSON})
+    """
+    graph.build_columns()
+    names = graph.city_names
+    
+    cities = [
+        {'name': name, 'latitude': latitude, 'longitude': longitude}
+        for name, latitude, longitude in zip(names, graph.city_lat, graph.city_lon)
+    ]
+    routes = [
+        {
+            'origin': names[src],
+            'destination': names[dst],
+            'distance': distance,
+            'cost': cost,
+            'bidirectional': bidirectional
+        }
+        for src, dst, distance, cost, bidirectional in zip(
+            graph.route_src, graph.route_dst, graph.route_dist,
+            graph.route_cost, graph.route_bidirectional)
+    ]
+    city_json = {
+        city._key: _dump_json(data)
+        for city, data in zip(graph.get_all_cities(), cities)
+    }
+    routes_from_json = {
+        city._key: _dump_json([route.to_dict() for route in graph.get_neighbors(city)])
+        for city in graph.get_all_cities()
+    }
+    
+    cities.sort(key=lambda city: city['name'])
+    return _dump_json(cities), _dump_json(routes), city_json, routes_from_json
+
+
+def _etag(content):
+    """
+    ETag for a fixed response body.
+    
+    Weak, because GZipMiddleware may send the same body compressed or
+    uncompressed under this tag.
+    """
+    return f'W/"{hashlib.sha1(content).hexdigest()}"'
+
+
+def _etag_matches(if_none_match, etag):
+    """
+    Check an If-None-Match header against an ETag.
+    
+    The header may be "*" or a comma-separated list of tags. Tags are
+    compared weakly, as If-None-Match requires, so a W/ prefix on either
+    side is ignored.
+    """
+    if not if_none_match:
+        return False
+    
+    opaque = etag.removeprefix('W/')
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == opaque:
+            return True
+    return False
+
+
+def _static_json_response(request, content, etag):
+    """
+    Response for a JSON body that doesn't change while the server runs.
+    
+    Clients that send the current ETag in If-None-Match get an empty
+    304 Not Modified instead of the body.
+    """
+    headers = {"ETag": etag}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+if graph is not None:
+    CITIES_JSON, ROUTES_JSON, CITY_JSON, ROUTES_FROM_JSON = _build_data_responses(graph)
+    CITIES_ETAG = _etag(CITIES_JSON)
+    ROUTES_ETAG = _etag(ROUTES_JSON)
+
+
+@lru_cache(maxsize=4096)
+def _find_path_json(origin_key, destination_key, optimize_by):
+    """
+    Serialized /find-path response body for one query.
+    
+    Memoized per (origin, destination, optimize_by): the graph is not
+    modified after startup, so a repeated query skips the search and the
+    response encoding. Callers pass the resolved cities' lookup keys, so
+    spellings differing only in case or spacing share one entry.
+    
+    Args:
+        origin_key (str): City._key of the origin
+        destination_key (str): City._key of the destination
+        optimize_by (str): 'distance' or 'cost'
+    
+    Returns:
+        bytes: JSON body matching PathResponse
+    """
+    trip = pathfinder.find_path(origin_key, destination_key, optimize_by=optimize_by)
+    
+    # Build segments
+    segments = [
+        {
+            'step': segment.step,
+            'from_city': segment.from_city,
+            'to_city': segment.to_city,
+            'distance': segment.distance,
+            'cost': segment.cost
+        }
+        for segment in trip.get_detailed_route()
+    ]
+    
+    return _dump_json({
+        'origin': trip.origin.name,
+        'destination': trip.destination.name,
+        'path': trip.get_path_names(),
+        'total_distance': float(trip.total_distance),
+        'total_cost': float(trip.total_cost),
+        'stops': trip.get_number_of_stops(),
+        'optimization_type': trip.optimization_type,
+        'segments': segments,
+        'valid': trip.is_valid()
+    })
+
+
+def _warm_up(graph):
+    """
+    Answer one query per optimization type before serving traffic.
+    
+    compute_all_pairs() already compiles the Numba kernel when it is
+    installed; this also runs trip construction and response encoding
+    once, so the first real /find-path request is not slower than later
+    ones. A failure here is reported but does not stop the server.
+    """
+    cities = graph.get_all_cities()
+    if not cities:
+        return
+    
+    try:
+        for optimize_by in ("distance", "cost"):
+            _find_path_json(cities[0]._key, cities[-1]._key, optimize_by)
+    except Exception as e:
+        print(f"⚠️ Warm-up query failed: {e}")
+
+
+if pathfinder is not None:
+    _warm_up(graph)
+
+
 # API Endpoints
 
 @app.get("/", tags=["General"])
@@ -120,24 +300,16 @@ async def health_check():
     }
 
 
-@app.get("/cities", response_model=List[CityResponse], tags=["Data"])
-async def get_cities():
+@app.get("/cities", responses={200: {"model": List[CityResponse]}}, tags=["Data"])
+async def get_cities(request: Request):
     """Get all available cities"""
     if graph is None:
         raise HTTPException(status_code=503, detail="Graph data not loaded")
     
-    cities = []
-    for city in graph.get_all_cities():
-        cities.append(CityResponse(
-            name=city.name,
-            latitude=city.latitude,
-            longitude=city.longitude
-        ))
-    
-    return sorted(cities, key=lambda x: x.name)
+    return _static_json_response(request, CITIES_JSON, CITIES_ETAG)
 
 
-@app.get("/cities/{city_name}", response_model=CityResponse, tags=["Data"])
+@app.get("/cities/{city_name}", responses={200: {"model": CityResponse}}, tags=["Data"])
 async def get_city(city_name: str):
     """Get details of a specific city"""
     if graph is None:
@@ -147,33 +319,19 @@ async def get_city(city_name: str):
     if city is None:
         raise HTTPException(status_code=404, detail=f"City '{city_name}' not found")
     
-    return CityResponse(
-        name=city.name,
-        latitude=city.latitude,
-        longitude=city.longitude
-    )
+    return Response(content=CITY_JSON[city._key], media_type="application/json")
 
 
-@app.get("/routes", response_model=List[RouteResponse], tags=["Data"])
-async def get_routes():
+@app.get("/routes", responses={200: {"model": List[RouteResponse]}}, tags=["Data"])
+async def get_routes(request: Request):
     """Get all available routes"""
     if graph is None:
         raise HTTPException(status_code=503, detail="Graph data not loaded")
     
-    routes = []
-    for route in graph.get_all_routes():
-        routes.append(RouteResponse(
-            origin=route.origin.name,
-            destination=route.destination.name,
-            distance=route.distance,
-            cost=route.cost,
-            bidirectional=route.bidirectional
-        ))
-    
-    return routes
+    return _static_json_response(request, ROUTES_JSON, ROUTES_ETAG)
 
 
-@app.get("/routes/from/{city_name}", response_model=List[RouteResponse], tags=["Data"])
+@app.get("/routes/from/{city_name}", responses={200: {"model": List[RouteResponse]}}, tags=["Data"])
 async def get_routes_from_city(city_name: str):
     """Get all routes from a specific city"""
     if graph is None:
@@ -183,20 +341,10 @@ async def get_routes_from_city(city_name: str):
     if city is None:
         raise HTTPException(status_code=404, detail=f"City '{city_name}' not found")
     
-    routes = []
-    for route in graph.get_neighbors(city):
-        routes.append(RouteResponse(
-            origin=route.origin.name,
-            destination=route.destination.name,
-            distance=route.distance,
-            cost=route.cost,
-            bidirectional=route.bidirectional
-        ))
-    
-    return routes
+    return Response(content=ROUTES_FROM_JSON[city._key], media_type="application/json")
 
 
-@app.post("/find-path", response_model=PathResponse, tags=["Pathfinding"])
+@app.post("/find-path", responses={200: {"model": PathResponse}}, tags=["Pathfinding"])
 async def find_path(request: PathRequest):
     """
     Find optimal path between two cities
@@ -215,37 +363,24 @@ async def find_path(request: PathRequest):
             detail="optimize_by must be 'distance' or 'cost'"
         )
     
-    try:
-        # Find the path
-        trip = pathfinder.find_path(
-            request.origin,
-            request.destination,
-            optimize_by=request.optimize_by
+    origin = graph.get_city(request.origin)
+    if origin is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Origin city '{request.origin}' not found in graph"
         )
-        
-        # Build segments
-        segments = []
-        for segment_data in trip.get_detailed_route():
-            segments.append(PathSegment(
-                step=segment_data['step'],
-                from_city=segment_data['from'],
-                to_city=segment_data['to'],
-                distance=segment_data['distance'],
-                cost=segment_data['cost']
-            ))
-        
-        return PathResponse(
-            origin=trip.origin.name,
-            destination=trip.destination.name,
-            path=trip.get_path_names(),
-            total_distance=trip.total_distance,
-            total_cost=trip.total_cost,
-            stops=trip.get_number_of_stops(),
-            optimization_type=trip.optimization_type,
-            segments=segments,
-            valid=trip.is_valid()
+    destination = graph.get_city(request.destination)
+    if destination is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Destination city '{request.destination}' not found in graph"
         )
     
+    try:
+        # Find the path (served from the response cache when repeated)
+        content = _find_path_json(origin._key, destination._key, request.optimize_by)
+        return Response(content=content, media_type="application/json")
+    
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
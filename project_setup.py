@@ -37,61 +37,74 @@ def create_project_structure():
     
     print("🚀 Setting up Travel Route Optimizer project structure...\n")
     
-    # Create directories and files
-    for folder, contents in structure.items():
-        create_directory_structure(folder, contents)
+    # Create all directories first, then every file in one pass
+    directories, files = flatten_structure(structure)
+    for directory in directories:
+        create_directory(directory)
     
-    # Create root files
-    for file in root_files:
+    for file in files + root_files:
         create_file(file)
     
     print("\n✅ Project structure created successfully!")
     print("\n📁 Project Structure:")
     print_tree(".", prefix="")
 
-def create_directory_structure(base_path, structure, parent=""):
-    """Recursively creates directories and files"""
-    full_path = os.path.join(parent, base_path) if parent else base_path
+def flatten_structure(structure):
+    """Flattens the nested structure into (directories, files) path lists, parents first"""
+    directories = []
+    files = []
+    stack = [(folder, contents) for folder, contents in reversed(structure.items())]
     
-    if not os.path.exists(full_path):
-        os.makedirs(full_path)
-        print(f"📂 Created directory: {full_path}")
+    while stack:
+        path, contents = stack.pop()
+        directories.append(path)
+        if isinstance(contents, dict):
+            stack.extend((os.path.join(path, key), value) for key, value in reversed(contents.items()))
+        else:
+            files.extend(os.path.join(path, file) for file in contents)
     
-    if isinstance(structure, dict):
-        for key, value in structure.items():
-            create_directory_structure(key, value, full_path)
-    elif isinstance(structure, list):
-        for file in structure:
-            file_path = os.path.join(full_path, file)
-            create_file(file_path)
+    return directories, files
+
+def create_directory(path):
+    """Creates a directory (and missing parents) if it doesn't exist"""
+    try:
+        os.makedirs(path)
+    except FileExistsError:
+        return
+    print(f"📂 Created directory: {path}")
 
 def create_file(file_path):
     """Creates an empty file if it doesn't exist"""
-    if not os.path.exists(file_path):
-        with open(file_path, 'w') as f:
+    # Exclusive mode fails on existing files, so no separate exists() check
+    try:
+        with open(file_path, 'x') as f:
             if file_path.endswith('.py'):
                 f.write('"""\nTODO: Implementation pending\n"""\n')
-        print(f"📄 Created file: {file_path}")
+    except FileExistsError:
+        return
+    print(f"📄 Created file: {file_path}")
 
 def print_tree(directory, prefix=""):
     """Prints a tree view of the directory structure"""
+    # scandir entries cache the file type from the directory read, so the
+    # directory check below needs no extra stat call per entry
     try:
-        entries = sorted(os.listdir(directory))
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name)
     except PermissionError:
         return
     
     # Filter out unwanted files
-    entries = [e for e in entries if not e.startswith('.') and e != '__pycache__' and e != 'venv']
+    entries = [e for e in entries if not e.name.startswith('.') and e.name != '__pycache__' and e.name != 'venv']
     
     for i, entry in enumerate(entries):
-        path = os.path.join(directory, entry)
         is_last = i == len(entries) - 1
         current_prefix = "└── " if is_last else "├── "
-        print(f"{prefix}{current_prefix}{entry}")
+        print(f"{prefix}{current_prefix}{entry.name}")
         
-        if os.path.isdir(path):
+        if entry.is_dir(follow_symlinks=False):
             extension_prefix = "    " if is_last else "│   "
-            print_tree(path, prefix + extension_prefix)
+            print_tree(entry.path, prefix + extension_prefix)
 
 if __name__ == "__main__":
     create_project_structure()